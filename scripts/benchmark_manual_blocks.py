@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Times show_manual_blocks.py's keyword matcher against the per-keyword substring
+loop it replaced, over a large synthetic checklist, and checks that both flag
+the same tasks.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import show_manual_blocks  # noqa: E402
+
+FILLER_WORDS = ['implement', 'endpoint', 'profile', 'page', 'ensure', 'layout', 'cache', 'sync',
+                'token', 'handler', 'screen', 'migration', 'update', 'docs', 'settings', 'flow']
+
+def legacy_find_blocks(filepath, keywords):
+    """find_blocks_in_file() before the precompiled matcher: lowercase each task and test every keyword."""
+    blocks = []
+    with open(filepath, encoding='utf-8') as f:
+        for line in f:
+            match = show_manual_blocks.CHECKBOX_PATTERN.match(line.strip())
+            if match and match.group(1) == ' ':
+                task = line.strip()[6:]
+                for kw in keywords:
+                    if kw in task.lower():
+                        blocks.append(task)
+                        break
+    return blocks
+
+def synthetic_keywords(count, seed):
+    """Return count made-up two-word keywords that do not occur in the filler text."""
+    rng = random.Random(seed)
+    return [f"{''.join(rng.choices('bfgjkvwxz', k=5))} {''.join(rng.choices('bfgjkvwxz', k=4))}" for _ in range(count)]
+
+def write_checklist(path, tasks, keyword_rate, seed, keywords):
+    """Write a checklist of tasks items, about keyword_rate of them mentioning one of keywords."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(tasks):
+            words = rng.choices(FILLER_WORDS, k=rng.randint(4, 12))
+            if rng.random() < keyword_rate:
+                words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+            f.write(f"- [{rng.choice(' x')}] {' '.join(words).capitalize()}\n")
+
+def time_call(func, repeat):
+    """Best wall time of repeat calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the show_manual_blocks.py keyword matcher')
+    parser.add_argument('--tasks', type=int, default=200000, help='Checklist items in the synthetic file')
+    parser.add_argument('--keyword-rate', type=float, default=0.05, help='Share of items mentioning a keyword')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per measurement (best is reported)')
+    parser.add_argument('--extra-keywords', type=int, default=0,
+                        help='Made-up keywords added to the defaults, to see how matching scales with the keyword list')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the checklist')
+    args = parser.parse_args()
+
+    keywords = show_manual_blocks.load_keywords() + synthetic_keywords(args.extra_keywords, args.seed)
+    matcher = show_manual_blocks.KeywordMatcher(keywords)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'CHECKLIST.md')
+        write_checklist(path, args.tasks, args.keyword_rate, args.seed, keywords)
+
+        # The legacy loop compared mixed-case keywords with lowercased tasks, so compare on lowercased keywords
+        legacy_keywords = [kw.lower() for kw in keywords]
+        expected = legacy_find_blocks(path, legacy_keywords)
+        blocks = [task for task, _ in show_manual_blocks.find_blocks_in_file(path, matcher)]
+        if blocks != expected:
+            raise AssertionError('matcher and legacy loop flagged different tasks')
+
+        legacy = time_call(lambda: legacy_find_blocks(path, keywords), args.repeat)
+        current = time_call(lambda: show_manual_blocks.find_blocks_in_file(path, matcher), args.repeat)
+        print(f"{'legacy':<10} {legacy * 1000:10.2f} ms")
+        print(f"{'matcher':<10} {current * 1000:10.2f} ms")
+        print(f"{len(blocks)} of {args.tasks} tasks flagged with {len(matcher.keywords)} keywords, "
+              f"{legacy / current:.1f}x faster")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,32 @@
+import io
 import os
 import re
+import json
+import hashlib
+import argparse
+import tempfile
 from glob import glob
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-# Paths to all MASTER_SYNC.md files in the ecosystem
-REPO_PATHS = [
-    os.path.join('..', 'JustWorks', '.task', 'tasks', 'MASTER_SYNC.md'),
-    os.path.join('..', 'JustStuff', '.task', 'tasks', 'MASTER_SYNC.md'),
-    os.path.join('..', 'JustCreate', '.task', 'tasks', 'MASTER_SYNC.md'),
-]
+# Patterns used to find MASTER_SYNC.md files when neither --glob nor a config file is given
+DEFAULT_GLOBS = [os.path.join('..', '*', '.task', 'tasks', 'MASTER_SYNC.md')]
+
+# Optional config listing repos and/or glob patterns, relative to the config file:
+# {"repos": {"JustWorks": "../../JustWorks/.task/tasks/MASTER_SYNC.md"}, "globs": ["../../*/.task/tasks/MASTER_SYNC.md"]}
+# The shipped mvp_progress.json lists JustWorks, JustStuff and JustCreate next to the project root,
+# so each is shown in that order, with 0/0 if its sync file is missing
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mvp_progress.json')
+
+# Append-only NDJSON store of the counts of every version of each sync file seen
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mvp_progress_history.ndjson')
+
+# Index of the MASTER- tasks of all sync files, refreshed from files whose contents changed
+DEFAULT_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mvp_task_index.json')
+TASK_INDEX_VERSION = 2
+
+# Columns of the master task table, used when a table has no header row
+DEFAULT_COLUMNS = ['master task id', 'title', 'status', 'priority', 'due date', 'linked docs']
 
 # Regex to match checklist items
 CHECKBOX_PATTERN = re.compile(r'- \[( |x)\]')
@@ -15,62 +34,387 @@ CHECKBOX_PATTERN = re.compile(r'- \[( |x)\]')
 # Regex to match table rows with a status column marked as '✅ Completed' or 'Completed' (case-insensitive)
 TABLE_PATTERN = re.compile(r'\|.*?\|.*?\|.*?(✅ Completed|Completed)', re.IGNORECASE)
 
-def count_checkboxes(md_path):
-    checked = 0
-    total = 0
-    per_task = {}
+def empty_counts():
+    return {
+        'checked': 0,
+        'total': 0,
+        'per_task': {},
+        'integration_checked': 0,
+        'integration_total': 0,
+        'table_completed': 0,
+    }
+
+def table_cells(row):
+    """Returns the stripped cells of a Markdown table row, keeping empty ones."""
+    return [cell.strip() for cell in row.strip('|').split('|')]
+
+def parse_sync_lines(lines, tasks=None):
+    """
+    Collects checkbox, per-task, integration checklist and table status counts in
+    one pass over the lines. If a tasks list is given, a record of each MASTER- task
+    (id, title, status, priority, line and checklist items) is appended to it.
+    """
+    counts = empty_counts()
+    per_task = counts['per_task']
+    task_records = {}
+    columns = DEFAULT_COLUMNS
     current_task = None
     in_integration = False
-    integration_checked = 0
-    integration_total = 0
+    for line_number, line in enumerate(lines, 1):
+        s = line.strip()
+        if TABLE_PATTERN.search(s):
+            counts['table_completed'] += 1
+        # Integration Checklist section
+        if s.lower().startswith('## integration checklist'):
+            in_integration = True
+            continue
+        if in_integration and (s.startswith('---') or s.startswith('|')):
+            in_integration = False
+        if in_integration and CHECKBOX_PATTERN.match(s):
+            counts['integration_total'] += 1
+            if '[x]' in s:
+                counts['integration_checked'] += 1
+        # Master Task section
+        if s.startswith('|') and 'Master Task ID' in s:
+            current_task = None
+            columns = [cell.lower() for cell in table_cells(s)]
+            continue
+        if s.startswith('|') and s.count('|') > 3:
+            # Try to extract task ID
+            parts = [p.strip() for p in s.split('|') if p.strip()]
+            if len(parts) > 0 and parts[0].startswith('MASTER-'):
+                current_task = parts[0]
+                if current_task not in per_task:
+                    per_task[current_task] = {'checked': 0, 'total': 0, 'title': parts[1] if len(parts) > 1 else ''}
+                if tasks is not None and current_task not in task_records:
+                    row = dict(zip(columns, table_cells(s)))
+                    task_records[current_task] = {
+                        'id': current_task,
+                        'title': row.get('title', ''),
+                        'status': row.get('status', ''),
+                        'priority': row.get('priority', ''),
+                        'line': line_number,
+                        'items': [],
+                    }
+                    tasks.append(task_records[current_task])
+            continue
+        match = CHECKBOX_PATTERN.match(s)
+        if match and current_task:
+            per_task[current_task]['total'] += 1
+            if match.group(1) == 'x':
+                per_task[current_task]['checked'] += 1
+            if tasks is not None:
+                task_records[current_task]['items'].append(
+                    {'text': s[match.end():].strip(), 'checked': match.group(1) == 'x', 'line': line_number})
+        if match:
+            counts['total'] += 1
+            if match.group(1) == 'x':
+                counts['checked'] += 1
+    return counts
+
+def parse_sync_file(md_path):
+    """Returns the counts of a MASTER_SYNC.md file, all zero if it does not exist."""
     if not os.path.exists(md_path):
-        return 0, 0, {}, (0, 0)
+        return empty_counts()
     with open(md_path, encoding='utf-8') as f:
-        for line in f:
-            s = line.strip()
-            # Integration Checklist section
-            if s.lower().startswith('## integration checklist'):
-                in_integration = True
-                continue
-            if in_integration and (s.startswith('---') or s.startswith('|')):
-                in_integration = False
-            if in_integration and CHECKBOX_PATTERN.match(s):
-                integration_total += 1
-                if '[x]' in s:
-                    integration_checked += 1
-            # Master Task section
-            if s.startswith('|') and '|' in s and 'Master Task ID' in s:
-                current_task = None
-                continue
-            if s.startswith('|') and '|' in s and s.count('|') > 3:
-                # Try to extract task ID
-                parts = [p.strip() for p in s.split('|') if p.strip()]
-                if len(parts) > 0 and parts[0].startswith('MASTER-'):
-                    current_task = parts[0]
-                    if current_task not in per_task:
-                        per_task[current_task] = {'checked': 0, 'total': 0, 'title': parts[1] if len(parts) > 1 else ''}
-                continue
-            match = CHECKBOX_PATTERN.match(s)
-            if match and current_task:
-                per_task[current_task]['total'] += 1
-                if match.group(1) == 'x':
-                    per_task[current_task]['checked'] += 1
-            if match:
-                total += 1
-                if match.group(1) == 'x':
-                    checked += 1
-    return checked, total, per_task, (integration_checked, integration_total)
+        return parse_sync_lines(f)
+
+def count_checkboxes(md_path):
+    counts = parse_sync_file(md_path)
+    return (counts['checked'], counts['total'], counts['per_task'],
+            (counts['integration_checked'], counts['integration_total']))
 
 def count_table_tasks(md_path):
-    completed = 0
-    if not os.path.exists(md_path):
-        return 0
-    with open(md_path, encoding='utf-8') as f:
+    return parse_sync_file(md_path)['table_completed']
+
+def repo_name(md_path):
+    """Returns the repo owning a sync file: the directory holding .task/tasks/, or else the file's directory."""
+    parts = os.path.normpath(os.path.abspath(md_path)).split(os.sep)
+    if len(parts) >= 4 and parts[-3:-1] == ['.task', 'tasks']:
+        return parts[-4]
+    return parts[-2]
+
+def load_config(config_path):
+    """
+    Returns (repos, globs) of a config file: a dict of repo name to sync file path and
+    a list of glob patterns. Raises ValueError if the file cannot be read or has the wrong shape.
+    """
+    try:
+        with open(config_path, encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f'cannot read {config_path}: {e}')
+    if not isinstance(config, dict):
+        raise ValueError(f'{config_path} must hold a JSON object')
+    listed = config.get('repos', {})
+    if isinstance(listed, list):
+        if not all(isinstance(entry, dict) and isinstance(entry.get('name'), str) and isinstance(entry.get('path'), str)
+                   for entry in listed):
+            raise ValueError(f'each entry of "repos" in {config_path} must have a "name" and a "path" string')
+        listed = {entry['name']: entry['path'] for entry in listed}
+    if not isinstance(listed, dict) or not all(isinstance(path, str) for path in listed.values()):
+        raise ValueError(f'"repos" in {config_path} must map repo names to paths, or list {{"name", "path"}} entries')
+    globs = config.get('globs', [])
+    if not isinstance(globs, list) or not all(isinstance(pattern, str) for pattern in globs):
+        raise ValueError(f'"globs" in {config_path} must be a list of patterns')
+    return listed, globs
+
+def discover_repos(config_path=DEFAULT_CONFIG, patterns=None):
+    """
+    Returns (repo, path) for each sync file named by the patterns, else the config file, else DEFAULT_GLOBS.
+    Raises ValueError if the config file is malformed.
+    """
+    repos = []
+    if not patterns:
+        if config_path and os.path.exists(config_path):
+            listed, globs = load_config(config_path)
+            base = os.path.dirname(os.path.abspath(config_path))
+            repos.extend((name, os.path.join(base, path)) for name, path in listed.items())
+            patterns = [os.path.join(base, pattern) for pattern in globs]
+        else:
+            patterns = DEFAULT_GLOBS
+    for pattern in patterns:
+        repos.extend((repo_name(path), path) for path in sorted(glob(pattern)))
+
+    # A file matched by several patterns is only counted once
+    seen = set()
+    unique = []
+    for name, path in repos:
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen:
+            seen.add(key)
+            unique.append((name, path))
+    return unique
+
+def load_history(store_path):
+    """Returns the records of the progress store in the order they were appended, skipping damaged lines."""
+    records = []
+    if not os.path.exists(store_path):
+        return records
+    with open(store_path, encoding='utf-8') as f:
         for line in f:
-            match = TABLE_PATTERN.search(line.strip())
-            if match:
-                completed += 1
-    return completed
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and 'counts' in record:
+                records.append(record)
+    return records
+
+def append_history(store_path, records):
+    """Appends records to the progress store, one JSON object per line."""
+    if not records:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(store_path)), exist_ok=True)
+    with open(store_path, 'a', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+
+def store_path(md_path, base):
+    """Returns the path of a sync file as recorded in the progress store and task index: relative to base, with / separators."""
+    try:
+        return os.path.relpath(md_path, base).replace(os.sep, '/')
+    except ValueError:
+        # On another drive than base
+        return os.path.abspath(md_path)
+
+def parse_repo(repo, md_path, latest=None, base=os.curdir):
+    """
+    Returns (counts, record) for a sync file. If its hash matches the latest stored
+    record the stored counts are reused and record is None; otherwise the file is
+    parsed and record is the new entry for the progress store, with the path
+    relative to base.
+    """
+    try:
+        with open(md_path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return empty_counts(), None
+    digest = hashlib.sha256(data).hexdigest()
+    if latest is not None and latest.get('sha256') == digest:
+        return latest['counts'], None
+    # Universal newlines, as when the file is read in text mode
+    counts = parse_sync_lines(io.StringIO(data.decode('utf-8'), newline=None))
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'repo': repo,
+        'path': store_path(md_path, base),
+        'sha256': digest,
+        'counts': counts,
+    }
+    return counts, record
+
+def parse_repos(repos, jobs=8, history=None, base=os.curdir):
+    """
+    Parses the sync files of all repos concurrently, returning (counts, new_records)
+    with counts in the same order. Files unchanged since their latest record in
+    history are not parsed again. Paths in history and new_records are relative to base.
+    """
+    latest = {}
+    for record in history or []:
+        latest[(record['repo'], record['path'])] = record
+
+    def parse(repo_path):
+        repo, path = repo_path
+        return parse_repo(repo, path, latest.get((repo, store_path(path, base))), base)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        results = list(executor.map(parse, repos))
+    return [counts for counts, _ in results], [record for _, record in results if record is not None]
+
+def index_sync_file(repo, md_path, entry=None, base=os.curdir):
+    """
+    Returns the task index entry of a sync file, reusing entry if the file's size and
+    mtime, or failing that its hash, are unchanged. Task paths are relative to base.
+    Returns None if the file is missing.
+    """
+    try:
+        stat = os.stat(md_path)
+    except FileNotFoundError:
+        return None
+    if entry is not None and entry['repo'] == repo and [entry['size'], entry['mtime_ns']] == [stat.st_size, stat.st_mtime_ns]:
+        return entry
+    with open(md_path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if entry is not None and entry['repo'] == repo and entry['sha256'] == digest:
+        tasks = entry['tasks']
+    else:
+        tasks = []
+        parse_sync_lines(io.StringIO(data.decode('utf-8'), newline=None), tasks)
+        for task in tasks:
+            task['repo'] = repo
+            task['path'] = store_path(md_path, base)
+    return {'repo': repo, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest, 'tasks': tasks}
+
+def save_task_index(index_path, files):
+    """Writes the task index via a temporary file in the same directory, so readers never see a partial index."""
+    directory = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': TASK_INDEX_VERSION, 'files': files}, f, ensure_ascii=False)
+        # mkstemp creates the file as 0600; give it the mode open() would have
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, index_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+# Fields of each task in the task index, with their types
+TASK_FIELDS = {'id': str, 'title': str, 'status': str, 'priority': str, 'line': int, 'items': list, 'repo': str, 'path': str}
+ITEM_FIELDS = {'text': str, 'checked': bool, 'line': int}
+
+def has_fields(record, fields):
+    return isinstance(record, dict) and all(isinstance(record.get(field), kind) for field, kind in fields.items())
+
+def is_index_entry(entry):
+    """Returns True if entry has the fields and types that index_sync_file writes."""
+    return (has_fields(entry, {'repo': str, 'size': int, 'mtime_ns': int, 'sha256': str, 'tasks': list})
+            and all(has_fields(task, TASK_FIELDS) and all(has_fields(item, ITEM_FIELDS) for item in task['items'])
+                    for task in entry['tasks']))
+
+def load_task_index(index_path, repos, jobs=8, rebuild=False):
+    """
+    Returns the MASTER- tasks of all repos from the task index, in discovery order.
+    Only sync files that changed since the index was saved are parsed again, and the
+    index is saved if anything changed. Paths in the index are relative to its directory.
+    """
+    base = os.path.dirname(os.path.abspath(index_path))
+    files = {}
+    if not rebuild and os.path.exists(index_path):
+        try:
+            with open(index_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if isinstance(data, dict) and data.get('version') == TASK_INDEX_VERSION and isinstance(data.get('files'), dict):
+            # A malformed entry is dropped, so its file is simply parsed again
+            files = {key: entry for key, entry in data['files'].items() if is_index_entry(entry)}
+
+    def refresh(repo_path):
+        repo, path = repo_path
+        return index_sync_file(repo, path, files.get(store_path(path, base)), base)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        entries = list(executor.map(refresh, repos))
+
+    updated = {}
+    for (_, path), entry in zip(repos, entries):
+        if entry is not None:
+            updated[store_path(path, base)] = entry
+    if updated.keys() != files.keys() or any(updated[key] is not files[key] for key in updated):
+        save_task_index(index_path, updated)
+    return [task for entry in updated.values() for task in entry['tasks']]
+
+def query_tasks(tasks, status=None, priority=None, repo=None, keyword=None):
+    """Returns the tasks matching every given filter; status, priority and repo match case-insensitively, keyword anywhere in the task."""
+    keyword = keyword.lower() if keyword else None
+    matches = []
+    for task in tasks:
+        if status and task['status'].lower() != status.lower():
+            continue
+        if priority and task['priority'].lower() != priority.lower():
+            continue
+        if repo and task['repo'].lower() != repo.lower():
+            continue
+        if keyword and not any(keyword in text.lower() for text in
+                               [task['id'], task['title']] + [item['text'] for item in task['items']]):
+            continue
+        matches.append(task)
+    return matches
+
+def print_tasks(tasks):
+    for task in tasks:
+        done = sum(1 for item in task['items'] if item['checked'])
+        print(f"{task['id']:<12} {task['status'] or '-':<12} {task['priority'] or '-':<8} {task['title']}"
+              f"  ({done}/{len(task['items'])} items, {task['repo']}:{task['line']})")
+    print(f'{len(tasks)} tasks')
+
+def print_open_subtasks(tasks, task_id, base=os.curdir):
+    """Prints the unchecked checklist items of a MASTER- task in every repo that lists it, with task paths relative to base."""
+    found = False
+    for task in tasks:
+        if task['id'].lower() != task_id.lower():
+            continue
+        found = True
+        open_items = [item for item in task['items'] if not item['checked']]
+        print(f"\n=== {task['id']} {task['title']} ({task['repo']}) ===")
+        for item in open_items:
+            print(f"- [ ] {item['text']}  ({os.path.relpath(os.path.join(base, task['path']))}:{item['line']})")
+        if not open_items:
+            print('No open subtasks')
+    if not found:
+        print(f'No task {task_id} in the index')
+
+def format_percent(checked, total):
+    return f"{(checked / total * 100) if total else 0:.0f}%"
+
+def print_history(records):
+    """Prints checklist completion of each repo and each MASTER- task over time, from the stored records."""
+    by_repo = {}
+    for record in records:
+        by_repo.setdefault(record['repo'], []).append(record)
+    if not by_repo:
+        print('No progress history recorded yet')
+        return
+    for repo, entries in by_repo.items():
+        print(f'\n=== {repo} ===')
+        tasks = {}
+        for entry in entries:
+            counts = entry['counts']
+            print_bar(entry['timestamp'].replace('T', ' '), counts['checked'], counts['total'], bar_len=10)
+            for task_id, task in counts['per_task'].items():
+                trend = tasks.setdefault(task_id, {'title': task['title'], 'points': []})['points']
+                percent = format_percent(task['checked'], task['total'])
+                # Only show the points where the task's completion changed
+                if not trend or trend[-1][0] != percent:
+                    trend.append((percent, entry['timestamp'][:10]))
+        for task_id, task in tasks.items():
+            trend = ' -> '.join(f'{percent} ({date})' for percent, date in task['points'])
+            print(f"  {task_id} {task['title']}: {trend}")
 
 def print_bar(label, checked, total, bar_len=20):
     percent = (checked / total * 100) if total else 0
@@ -79,31 +423,74 @@ def print_bar(label, checked, total, bar_len=20):
     print(f"{label}: [{bar}] {percent:.0f}% ({checked}/{total})")
 
 def main():
-    repo_names = ['JustWorks', 'JustStuff', 'JustCreate']
+    parser = argparse.ArgumentParser(description='Show MVP progress from the MASTER_SYNC.md files of all repos.')
+    parser.add_argument('--config', default=DEFAULT_CONFIG,
+                        help='JSON file listing "repos" (name to path) and/or "globs" of sync files')
+    parser.add_argument('--glob', action='append', dest='globs', metavar='PATTERN',
+                        help=f'Glob pattern of MASTER_SYNC.md files, instead of the config (default: {DEFAULT_GLOBS[0]})')
+    parser.add_argument('--jobs', type=int, default=8, help='Number of files read concurrently')
+    parser.add_argument('--store', default=DEFAULT_STORE,
+                        help='NDJSON file that records the counts of each new version of a sync file')
+    parser.add_argument('--no-store', action='store_true', help='Neither read nor append to the progress store')
+    parser.add_argument('--history', action='store_true',
+                        help='Show per-repo and per-task completion over time from the store, without reading sync files')
+
+    query = parser.add_argument_group('task queries', 'Answered from the task index, which is refreshed from changed sync files')
+    query.add_argument('--tasks', action='store_true', help='List MASTER- tasks matching the filters below')
+    query.add_argument('--status', help='Only tasks with this status, e.g. "Not Started"')
+    query.add_argument('--priority', help='Only tasks with this priority, e.g. High')
+    query.add_argument('--repo', help='Only tasks of this repo')
+    query.add_argument('--search', metavar='KEYWORD', help='Only tasks whose ID, title or checklist items contain KEYWORD')
+    query.add_argument('--subtasks', metavar='TASK_ID', help='List the open checklist items of a MASTER- task')
+    query.add_argument('--index', default=DEFAULT_INDEX, help='Task index file')
+    query.add_argument('--rebuild-index', action='store_true', help='Parse every sync file again instead of reusing the index')
+    args = parser.parse_args()
+
+    def discover():
+        try:
+            return discover_repos(args.config, args.globs)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.tasks or args.subtasks or args.status or args.priority or args.repo or args.search:
+        tasks = load_task_index(args.index, discover(), args.jobs, args.rebuild_index)
+        if args.subtasks:
+            print_open_subtasks(tasks, args.subtasks, os.path.dirname(os.path.abspath(args.index)))
+        else:
+            print_tasks(query_tasks(tasks, args.status, args.priority, args.repo, args.search))
+        return
+
+    history = [] if args.no_store else load_history(args.store)
+    if args.history:
+        print_history(history)
+        return
+
+    repos = discover()
+    if not repos:
+        print('No MASTER_SYNC.md files found')
+        return
     overall_checked = 0
     overall_total = 0
     overall_integration_checked = 0
     overall_integration_total = 0
-    overall_per_task = {}
-    for idx, md_path in enumerate(REPO_PATHS):
-        repo = repo_names[idx]
-        checked, total, per_task, (integration_checked, integration_total) = count_checkboxes(md_path)
-        overall_checked += checked
-        overall_total += total
-        overall_integration_checked += integration_checked
-        overall_integration_total += integration_total
+    tbl_checked = 0
+    results, new_records = parse_repos(repos, args.jobs, history, os.path.dirname(os.path.abspath(args.store)))
+    if not args.no_store:
+        append_history(args.store, new_records)
+    for (repo, _), counts in zip(repos, results):
+        overall_checked += counts['checked']
+        overall_total += counts['total']
+        overall_integration_checked += counts['integration_checked']
+        overall_integration_total += counts['integration_total']
+        tbl_checked += counts['table_completed']
         print(f'\n=== {repo} ===')
-        print_bar('Integration Checklist', integration_checked, integration_total, bar_len=10)
-        incomplete_tasks = sum(1 for d in per_task.values() if d['checked'] < d['total'])
+        print_bar('Integration Checklist', counts['integration_checked'], counts['integration_total'], bar_len=10)
+        incomplete_tasks = sum(1 for d in counts['per_task'].values() if d['checked'] < d['total'])
         if incomplete_tasks > 0:
             print(f'  {incomplete_tasks} master tasks remaining')
     print('\n=== OVERALL ===')
     print_bar('All Integration Checklists', overall_integration_checked, overall_integration_total, bar_len=10)
     print_bar('TOTAL (All Checklists)', overall_checked, overall_total, bar_len=10)
-    tbl_checked = 0
-    for md_path in REPO_PATHS:
-        tc = count_table_tasks(md_path)
-        tbl_checked += tc
     print(f"Table Tasks Completed: {tbl_checked}")
 
 if __name__ == '__main__':
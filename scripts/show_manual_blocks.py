@@ -1,43 +1,127 @@
 import os
 import re
+import json
+import argparse
 
 # Paths to critical JustWorks files
 SETUP_CHECKLIST = os.path.join('..', 'JustWorks', 'SETUP_CHECKLIST.md')
 MASTER_SYNC = os.path.join('..', 'JustWorks', '.task', 'tasks', 'MASTER_SYNC.md')
 
+# Config file with the "keywords" list of tasks AI cannot do (manual, human, review, secret, etc.),
+# shared by every copy of this script
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts', 'manual_blocks.json')
+
 CHECKBOX_PATTERN = re.compile(r'- \[( |x)\]')
 
-# List of keywords that indicate tasks AI cannot do (manual, human, review, secret, etc.)
-BLOCK_KEYWORDS = [
-    'manual', 'human', 'review', 'secret', 'private key', 'apple developer', 'cloud console',
-    'set up', 'configure', 'create', 'register', 'password', 'api key', 'callback', 'developer portal',
-    'test on device', 'QA', 'verify', 'credential', 'team id', 'client id', 'secret', 'download', 'upload'
-]
+def load_keywords(config_path=DEFAULT_CONFIG):
+    """Returns the keywords of the config file, matched case-insensitively."""
+    with open(config_path, encoding='utf-8') as f:
+        return json.load(f)['keywords']
+
+def trie_pattern(keywords):
+    """Returns a regex matching any of the keywords, with shared prefixes merged into a trie of nested groups."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def branch(node):
+        alternatives = [re.escape(char) + branch(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return branch(trie)
+
+class KeywordMatcher:
+    """
+    Finds which of a set of keywords occur in a text, ignoring case, like testing
+    each keyword against the lowercased text but with one precompiled trie regex,
+    so the cost of a scan barely grows with the number of keywords. Only texts
+    with a match are checked keyword by keyword to report which ones occur.
+    """
+
+    def __init__(self, keywords):
+        # Duplicates, including ones differing only in case, are checked once
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+        self.pattern = re.compile(trie_pattern(self.keywords)) if self.keywords else None
+
+    def search(self, text):
+        """Returns True if any keyword occurs in text."""
+        return self.pattern is not None and self.pattern.search(text.lower()) is not None
+
+    def matches(self, text):
+        """Returns the keywords occurring in text, in the order they were configured."""
+        text = text.lower()
+        if self.pattern is None or self.pattern.search(text) is None:
+            return []
+        return [keyword for keyword in self.keywords if keyword in text]
 
-def find_blocks_in_file(filepath):
+def find_blocks_in_text(text, matcher):
+    """
+    Returns (task, keywords) for each unchecked task in text that mentions a
+    keyword. The whole text is scanned for keywords at once, and only the lines
+    with a hit are parsed as tasks.
+    """
     blocks = []
-    if not os.path.exists(filepath):
+    if matcher.pattern is None:
         return blocks
-    with open(filepath, encoding='utf-8') as f:
-        for line in f:
-            match = CHECKBOX_PATTERN.match(line.strip())
-            if match and match.group(1) == ' ':
-                # Only consider unchecked tasks
-                task = line.strip()[6:]
-                for kw in BLOCK_KEYWORDS:
-                    if kw in task.lower():
-                        blocks.append(task)
-                        break
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        lines = []
+        end = -1
+        for hit in matcher.pattern.finditer(lowered):
+            if hit.start() < end:
+                # Another hit on a line already taken
+                continue
+            start = text.rfind('\n', 0, hit.start()) + 1
+            end = text.find('\n', hit.start())
+            if end == -1:
+                end = len(text)
+            lines.append(text[start:end])
+    else:
+        # Lowercasing changed some lengths, so offsets into lowered do not match text
+        lines = text.split('\n')
+    for line in lines:
+        match = CHECKBOX_PATTERN.match(line.strip())
+        if match and match.group(1) == ' ':
+            # Only consider unchecked tasks
+            task = line.strip()[6:]
+            keywords = matcher.matches(task)
+            if keywords:
+                blocks.append((task, keywords))
     return blocks
 
+def find_blocks_in_file(filepath, matcher=None):
+    """Returns (task, keywords) for each unchecked task of the file that mentions a blocking keyword."""
+    if matcher is None:
+        matcher = KeywordMatcher(load_keywords())
+    if not os.path.exists(filepath):
+        return []
+    with open(filepath, encoding='utf-8') as f:
+        return find_blocks_in_text(f.read(), matcher)
+
 def main():
+    parser = argparse.ArgumentParser(description='List unchecked tasks that may need a human.')
+    parser.add_argument('--keywords-file', default=DEFAULT_CONFIG,
+                        help='JSON file with a "keywords" list (default: scripts/manual_blocks.json)')
+    args = parser.parse_args()
+
+    try:
+        keywords = load_keywords(args.keywords_file)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f'cannot read keywords from {args.keywords_file}: {e}')
+    matcher = KeywordMatcher(keywords)
     blocks = []
-    blocks += find_blocks_in_file(SETUP_CHECKLIST)
-    blocks += find_blocks_in_file(MASTER_SYNC)
+    blocks += find_blocks_in_file(SETUP_CHECKLIST, matcher)
+    blocks += find_blocks_in_file(MASTER_SYNC, matcher)
     if blocks:
         print('--- Manual/Human Tasks That May Block Automation ---')
-        for b in blocks:
-            print(f'- {b}')
+        for task, keywords in blocks:
+            print(f"- {task} ({', '.join(keywords)})")
     else:
         print('No manual/human/blocked tasks found!')
 
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+Documentation Control System (DCS) Benchmarks
+
+This script times the hot paths of update_docs.py against synthetic documents
+so that performance changes to the DCS tool can be measured before and after.
+It can also generate a synthetic DCS project on disk (--generate), and save
+results as JSON (--output) to compare against another commit (--compare).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import datetime
+import platform
+import tempfile
+import subprocess
+import yaml
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import update_docs  # noqa: E402
+import generate_file_structure  # noqa: E402
+
+# Whole-file pattern used by extract_metadata() before the streaming reader
+LEGACY_METADATA_PATTERN = r"---\s*\n(.*?)\n\s*---"
+
+def write_document(path: str, doc_id: str, body_bytes: int, header_entries: int = 0,
+                   depends_on: Optional[List[str]] = None, affects: Optional[List[str]] = None,
+                   last_updated: str = '2024-01-01') -> None:
+    """
+    Write a document with a metadata header followed by a body of roughly body_bytes.
+    header_entries adds that many change_requires paths to enlarge the header.
+    """
+    requires = ''.join(f"- src/module_{i}/file_{i}.py\n" for i in range(header_entries))
+    affects = affects or []
+    header = (
+        "---\n"
+        f"doc_id: {doc_id}\n"
+        "version: 1.0.0\n"
+        f"last_updated: {last_updated}\n"
+        "updated_by: benchmark\n"
+        f"depends_on: [{', '.join(depends_on or [])}]\n"
+        + ("affects: ALL\n" if 'ALL' in affects else f"affects: [{', '.join(affects)}]\n")
+        + (f"change_requires:\n{requires}" if requires else "change_requires: []\n") +
+        "---\n"
+    )
+    paragraph = "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        f.write(paragraph * max(1, body_bytes // len(paragraph)))
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time in seconds over repeat calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def legacy_front_matter(file_path: str) -> Optional[str]:
+    """Read the whole file and regex-scan it, as extract_metadata() used to."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    match = re.search(LEGACY_METADATA_PATTERN, content, re.DOTALL)
+    return match.group(1) if match else None
+
+def bench_front_matter(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Compare whole-file regex extraction with the streaming front matter reader."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.docs):
+            path = os.path.join(tmp, f"doc-{i}.md")
+            write_document(path, f"DOC-{i}", args.body_kb * 1024)
+            paths.append(path)
+
+        for name, reader in [('legacy-regex', legacy_front_matter),
+                             ('streaming', lambda p: update_docs.read_front_matter(p).text)]:
+            elapsed = time_call(lambda: [reader(p) for p in paths], args.repeat)
+            results.append({'benchmark': 'front-matter', 'variant': name, 'docs': args.docs,
+                            'body_kb': args.body_kb, 'seconds': elapsed})
+    return results
+
+def synthetic_registry(doc_count: int, fanout: int = 3, seed: int = 0,
+                       all_nodes: int = 1, cycles: int = 1) -> Dict[str, Dict[str, object]]:
+    """
+    Build an in-memory registry of doc_count documents.
+    Each document depends on up to fanout earlier documents and affects up to fanout
+    later ones. The first all_nodes documents affect ALL, and cycles documents
+    spread through the registry are made to depend on one of their own dependents.
+    """
+    rng = random.Random(seed)
+    ids = [f"DOC-{i}" for i in range(doc_count)]
+    registry = {}
+    for i, doc_id in enumerate(ids):
+        depends = sorted({ids[rng.randrange(i)] for _ in range(fanout)}) if i else []
+        affects = sorted({ids[rng.randrange(i + 1, doc_count)] for _ in range(fanout)}) if i < doc_count - 1 else []
+        registry[doc_id] = {
+            'Document ID': doc_id,
+            'Path': f"docs/{doc_id}.md",
+            'Version': '1.0.0',
+            'Depends On': depends,
+            'Affects': ['ALL'] if i < all_nodes else affects,
+            'Change Requires': [f"src/{doc_id.lower()}.py"] if i % 4 == 0 else [],
+        }
+    
+    # Close a two-document dependency cycle back from a dependent to its dependency
+    dependents = [doc_id for doc_id in ids if registry[doc_id]['Depends On']]
+    for k in range(min(cycles, len(dependents))):
+        dependent = dependents[(k * len(dependents)) // max(1, cycles)]
+        dependency = registry[dependent]['Depends On'][0]
+        if dependent not in registry[dependency]['Depends On']:
+            registry[dependency]['Depends On'] = sorted(registry[dependency]['Depends On'] + [dependent])
+    return registry
+
+def legacy_check_circular(registry: Dict[str, Dict[str, object]]) -> List[str]:
+    """The recursive, per-root cycle check that check_document_consistency() used to run."""
+    issues = []
+
+    def check_circular(doc_id, visited=None, path=None):
+        if visited is None:
+            visited = set()
+        if path is None:
+            path = []
+        if doc_id in path:
+            issues.append(' -> '.join(path + [doc_id]))
+            return
+        if doc_id in visited:
+            return
+        visited.add(doc_id)
+        path.append(doc_id)
+        for dep_id in registry.get(doc_id, {}).get('Depends On', []):
+            check_circular(dep_id, visited, path.copy())
+
+    for doc_id in registry:
+        check_circular(doc_id)
+    return issues
+
+def bench_graph(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Time graph compilation, cycle detection and impact closure as the registry grows."""
+    results = []
+    for size in args.graph_sizes:
+        registry = synthetic_registry(size)
+        timings = {}
+
+        start = time.perf_counter()
+        graph = update_docs.RegistryGraph(update_docs.DocumentIndex(registry))
+        timings['compile'] = time.perf_counter() - start
+        timings['cycles'] = time_call(graph.dependency_cycles, args.repeat)
+        timings['impact'] = time_call(lambda: graph.impact_closure([1]), args.repeat)
+        if size <= args.legacy_max_docs:
+            timings['legacy-cycles'] = time_call(lambda: legacy_check_circular(registry), 1)
+
+        for variant, elapsed in timings.items():
+            results.append({'benchmark': 'graph', 'variant': f"{variant}/{size}", 'docs': size,
+                            'seconds': elapsed})
+    return results
+
+def bench_jobs(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Time DocumentIndex.preload() with an increasing number of workers and no cache."""
+    results = []
+    saved_root, saved_cache = update_docs.ROOT_DIR, update_docs.METADATA_CACHE
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = {}
+        os.makedirs(os.path.join(tmp, 'docs'))
+        for i in range(args.jobs_docs):
+            doc_id = f"DOC-{i}"
+            write_document(os.path.join(tmp, 'docs', f"{doc_id}.md"), doc_id, 4096, header_entries=40)
+            registry[doc_id] = {'Path': f"docs/{doc_id}.md", 'Version': '1.0.0'}
+
+        update_docs.ROOT_DIR, update_docs.METADATA_CACHE = tmp, None
+        try:
+            baseline = None
+            for jobs in args.jobs:
+                def preload():
+                    index = update_docs.DocumentIndex(registry)
+                    index.preload(jobs)
+                    return index
+                elapsed = time_call(preload, args.repeat)
+
+                # Parallel results must match the serial ones exactly
+                metadata = [record.metadata for record in preload()]
+                if baseline is None:
+                    baseline = metadata
+                elif metadata != baseline:
+                    raise AssertionError(f"--jobs {jobs} produced different metadata")
+
+                results.append({'benchmark': 'jobs', 'variant': f"jobs={jobs}", 'docs': args.jobs_docs,
+                                'seconds': elapsed})
+        finally:
+            update_docs.ROOT_DIR, update_docs.METADATA_CACHE = saved_root, saved_cache
+    return results
+
+# Front matter samples covering the fast path and the constructs it must defer to YAML
+YAML_EQUIVALENCE_SAMPLES = [
+    "doc_id: DOC-A\nversion: 1.0.0\nlast_updated: 2024-01-05\ndepends_on: [DOC-MASTER, DOC-B]\naffects: ALL",
+    "doc_id: DOC-A\nchange_requires:\n- src/a.py\n- 'config/b.json'\nupdated_by: \"Jane Doe\"",
+    "doc_id: DOC-A\ndepends_on:\n  - DOC-B\naffects: []\nchange_requires:",
+    "version: 1.0\nlast_updated: 2024-13-05",
+    "doc_id: DOC-A # trailing comment\nversion: '1.0.0'",
+    "updated_by: yes\naffects: [~, null]",
+    "doc_id: DOC-A\nversion: 1.0.0\nversion: 2.0.0",
+    "doc_id: DOC-A\nowner:\n  name: docs-team",
+    "doc_id: DOC-A\naffects: [DOC-B, [DOC-C]]",
+    "last_updated: 2024-01-05 10:30:00\nupdated_by: it's me",
+    "doc_id: 'it''s'\ndepends_on: [a, ]",
+    "affects: [DOC-B?, DOC-C]\ndepends_on: [a:b]",
+    "",
+]
+
+# Characters random front matter values are drawn from, weighted towards YAML indicators
+RANDOM_VALUE_CHARS = 'aZ1 -?:,[]{}#&*!|>\'"%@`.~_/'
+
+def random_front_matter(rng: random.Random) -> str:
+    """Build a front matter block of known DCS keys with short values that often contain YAML syntax."""
+    def value():
+        return ''.join(rng.choice(RANDOM_VALUE_CHARS) for _ in range(rng.randint(1, 5)))
+    lines = []
+    for key in rng.sample(sorted(update_docs.DCS_METADATA_KEYS), rng.randint(1, 3)):
+        form = rng.randrange(4)
+        items = [value() for _ in range(rng.randint(0, 3))]
+        if form == 0:
+            lines.append(f"{key}: {value()}")
+        elif form == 1:
+            lines.append(f"{key}: [{', '.join(items)}]")
+        elif form == 2:
+            lines.append(f"{key}:" + ''.join(f"\n- {item}" for item in items))
+        else:
+            lines.append(f"{key}: {rng.randint(1990, 2030)}-{rng.randint(0, 13):02d}-{rng.randint(0, 32):02d}")
+    return '\n'.join(lines)
+
+def check_yaml_equivalence(text: str) -> Optional[str]:
+    """
+    Compare the fast metadata parser with yaml.safe_load, and with libyaml's CSafeLoader
+    when available, on text. Where a loader rejects text, or the loaders disagree, the
+    fast parser must leave text to full YAML.
+    Returns a description of the first disagreement, or None if they agree.
+    """
+    fast = update_docs._parse_known_metadata(text)
+    if fast is None:
+        return None
+    loaders = [('yaml.safe_load', yaml.SafeLoader)]
+    if hasattr(yaml, 'CSafeLoader'):
+        loaders.append(('CSafeLoader', yaml.CSafeLoader))
+    for name, loader in loaders:
+        try:
+            expected = yaml.load(text, Loader=loader) or {}
+        except (yaml.YAMLError, ValueError):
+            return f"fast parser accepted front matter that {name} rejects: {text!r}"
+        if fast != expected or list(map(type, fast.values())) != list(map(type, expected.values())):
+            return f"fast parser disagrees with {name} on {text!r}: {fast!r} != {expected!r}"
+    return None
+
+def verify_yaml(samples: int, seed: int) -> int:
+    """
+    Check the fast metadata parser against the full YAML loaders on YAML_EQUIVALENCE_SAMPLES
+    and samples random blocks. Returns 0 if every block agrees, otherwise 1.
+    """
+    rng = random.Random(seed)
+    texts = YAML_EQUIVALENCE_SAMPLES + [random_front_matter(rng) for _ in range(samples)]
+    failures = [failure for failure in map(check_yaml_equivalence, texts) if failure]
+    for failure in failures[:20]:
+        print(failure)
+    fast = sum(1 for text in texts if update_docs._parse_known_metadata(text) is not None)
+    print(f"{len(texts) - len(failures)} of {len(texts)} front matter blocks agree with full YAML "
+          f"({fast} on the fast path)")
+    return 1 if failures else 0
+
+def bench_yaml(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """
+    Time the fast metadata parser against yaml.safe_load and libyaml's CSafeLoader
+    on typical DCS headers. Run --verify to check it on unusual ones.
+    """
+    texts = []
+    for i in range(args.docs):
+        requires = ''.join(f"- src/module_{n}/file_{n}.py\n" for n in range(i % 10))
+        texts.append(f"doc_id: DOC-{i}\nversion: 1.{i % 7}.0\nlast_updated: 2024-01-{i % 28 + 1:02d}\n"
+                     f"updated_by: benchmark\ndepends_on: [DOC-{i // 2}, DOC-MASTER]\naffects: []\n"
+                     f"change_requires:\n{requires}")
+
+    variants = [('safe_load', yaml.safe_load),
+                ('fast-path', update_docs._parse_known_metadata)]
+    if hasattr(yaml, 'CSafeLoader'):
+        variants.insert(1, ('CSafeLoader', lambda text: yaml.load(text, Loader=yaml.CSafeLoader)))
+
+    expected = [yaml.safe_load(text) for text in texts]
+    results = []
+    for name, parse in variants:
+        if [parse(text) for text in texts] != expected:
+            raise AssertionError(f"{name} output differs from yaml.safe_load")
+        elapsed = time_call(lambda: [parse(text) for text in texts], args.repeat)
+        results.append({'benchmark': 'yaml', 'variant': name, 'docs': args.docs, 'seconds': elapsed})
+    return results
+
+def write_corpus(root: str, registry: Dict[str, Dict[str, object]], body_bytes: int = 4096,
+                 header_entries: int = 0, seed: int = 0) -> None:
+    """
+    Lay out a DCS project under root: README-Master.md holding the registry table,
+    one document per registry entry, and a copy of update_docs.py in scripts/.
+    Document metadata mirrors the registry; last_updated dates are spread over
+    half a year so that validation finds some stale documents.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(root, 'docs'), exist_ok=True)
+    os.makedirs(os.path.join(root, 'scripts'), exist_ok=True)
+    shutil.copy(update_docs.__file__, os.path.join(root, 'scripts', 'update_docs.py'))
+
+    def cell(value):
+        return ', '.join(value) if isinstance(value, list) and value else (value or '-')
+
+    with open(os.path.join(root, 'README-Master.md'), 'w', encoding='utf-8') as f:
+        f.write("# Master\n\n### Document Registry\n\n")
+        f.write("| Document ID | Path | Version | Last Updated | Depends On | Affects | Change Requires |\n")
+        f.write("|-------------|------|---------|--------------|------------|---------|-----------------|\n")
+        for doc_id, data in registry.items():
+            f.write(f"| {doc_id} | {data['Path']} | {data['Version']} | 2024-01-01 | {cell(data['Depends On'])} "
+                    f"| {cell(data['Affects'])} | {cell(data['Change Requires'])} |\n")
+    start = datetime.date(2024, 1, 1)
+    for doc_id, data in registry.items():
+        last_updated = start + datetime.timedelta(days=rng.randrange(180))
+        write_document(os.path.join(root, data['Path']), doc_id, body_bytes, header_entries,
+                       data['Depends On'], data['Affects'], last_updated.isoformat())
+
+# Subcommands timed by the startup benchmark, with their arguments
+STARTUP_COMMANDS = {
+    'check': ['--check'],
+    'validate': ['--validate'],
+    'verify': ['--verify'],
+    'impact': ['--impact', 'DOC-1'],
+    'impact-batch': ['--impact-batch', 'DOC-1', 'DOC-2'],
+    'graph': ['--graph', '--graph-format', 'json'],
+}
+
+def bench_startup(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """
+    Time a fresh update_docs.py process per subcommand against warm on-disk caches.
+    Fails if a subcommand imports PyYAML or exceeds --startup-budget-ms.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(tmp, synthetic_registry(args.startup_docs))
+        script = os.path.join(tmp, 'scripts', 'update_docs.py')
+
+        for name, command in STARTUP_COMMANDS.items():
+            def run():
+                return subprocess.run([sys.executable, script, *command, '--profile-startup'],
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            run()  # Fill the caches
+            elapsed = time_call(run, args.repeat)
+
+            lazy_imports = run().stderr.rsplit('lazy imports:', 1)[-1].strip().split(', ')
+            if 'yaml' in lazy_imports:
+                raise AssertionError(f"{name} imported yaml with warm caches")
+            if elapsed * 1000 > args.startup_budget_ms:
+                raise AssertionError(f"{name} took {elapsed * 1000:.1f} ms, over the "
+                                     f"{args.startup_budget_ms} ms startup budget")
+
+            results.append({'benchmark': 'startup', 'variant': name, 'docs': args.startup_docs,
+                            'seconds': elapsed})
+    return results
+
+def corpus_registry(args: argparse.Namespace) -> Dict[str, Dict[str, object]]:
+    """Build the synthetic registry described by the corpus options."""
+    return synthetic_registry(args.corpus_docs, args.fanout, args.seed, args.all_nodes, args.cycles)
+
+def bench_corpus(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """
+    Time the main update_docs.py entry points against a synthetic project on disk,
+    each as a fresh run would call them: no metadata cache and a newly built index.
+    """
+    registry = corpus_registry(args)
+    saved = (update_docs.ROOT_DIR, update_docs.METADATA_CACHE, update_docs.DOCUMENT_REGISTRY)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(tmp, registry, args.corpus_body_kb * 1024, args.header_entries, args.seed)
+        update_docs.ROOT_DIR, update_docs.METADATA_CACHE = tmp, None
+        try:
+            loaded = update_docs.extract_document_registry_from_master()
+            if len(loaded) != len(registry):
+                raise AssertionError(f"registry parsed {len(loaded)} of {len(registry)} documents")
+            
+            def fresh(func):
+                def run():
+                    update_docs.DOCUMENT_REGISTRY = dict(loaded)
+                    update_docs.DOCUMENT_INDEX = update_docs.REGISTRY_GRAPH = None
+                    return func()
+                return run
+            
+            impact_source = next(iter(loaded)) if args.all_nodes else 'DOC-1'
+            calls = [
+                ('extract_registry', update_docs.extract_document_registry_from_master),
+                ('check_consistency', fresh(update_docs.check_document_consistency)),
+                ('analyze_impact', fresh(lambda: update_docs.analyze_impact(impact_source))),
+                ('validate_updates', fresh(update_docs.validate_document_updates)),
+                ('graph_text', fresh(lambda: update_docs.generate_dependency_graph('text'))),
+                ('graph_dot', fresh(lambda: update_docs.generate_dependency_graph('dot'))),
+            ]
+            for name, call in calls:
+                results.append({'benchmark': 'corpus', 'variant': name, 'docs': args.corpus_docs,
+                                'seconds': time_call(call, args.repeat)})
+        finally:
+            update_docs.ROOT_DIR, update_docs.METADATA_CACHE, update_docs.DOCUMENT_REGISTRY = saved
+            update_docs.DOCUMENT_INDEX = update_docs.REGISTRY_GRAPH = None
+    return results
+
+# Hard-coded exclusions of generate_file_structure.py before glob patterns
+LEGACY_EXCLUDED_DIRS = {'.git', 'node_modules', '__pycache__', '.vscode'}
+LEGACY_EXCLUDED_FILES = {'.DS_Store'}
+
+def legacy_generate_tree(start_path: str, indent: str = '', output_lines: Optional[List[str]] = None) -> List[str]:
+    """generate_tree() before the scandir walker: os.listdir plus isdir/isfile per entry, recursively."""
+    if output_lines is None:
+        output_lines = []
+    try:
+        items = os.listdir(start_path)
+    except OSError:
+        output_lines.append(f'{indent}+-- [Error reading directory]')
+        return output_lines
+    dirs = sorted([d for d in items if os.path.isdir(os.path.join(start_path, d))
+                   and d not in LEGACY_EXCLUDED_DIRS])
+    files = sorted([f for f in items if os.path.isfile(os.path.join(start_path, f))
+                    and f not in LEGACY_EXCLUDED_FILES])
+    entries = dirs + files
+    for i, entry in enumerate(entries):
+        connector = '|-- ' if i < len(entries) - 1 else '+-- '
+        output_lines.append(f'{indent}{connector}{entry}')
+        if entry in dirs:
+            new_indent = indent + ('|   ' if i < len(entries) - 1 else '    ')
+            legacy_generate_tree(os.path.join(start_path, entry), new_indent, output_lines)
+    return output_lines
+
+def write_tree(root: str, dirs: int, files_per_dir: int, fanout: int) -> None:
+    """Create dirs nested directories, fanout children each, holding files_per_dir empty files."""
+    paths = [root]
+    for i in range(1, dirs):
+        paths.append(os.path.join(paths[(i - 1) // fanout], f"dir_{i}"))
+    for path in paths:
+        os.makedirs(path, exist_ok=True)
+        for j in range(files_per_dir):
+            open(os.path.join(path, f"file_{j}.txt"), 'w').close()
+
+def bench_tree(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Time the directory tree walker of generate_file_structure.py against the recursive listdir version."""
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        tmp = os.path.join(workdir, 'tree')
+        write_tree(tmp, args.tree_dirs, args.tree_files, args.tree_fanout)
+        entries = args.tree_dirs * (args.tree_files + 1)
+        expected = legacy_generate_tree(tmp)
+        results.append({'benchmark': 'tree', 'variant': 'legacy', 'docs': entries,
+                        'seconds': time_call(lambda: legacy_generate_tree(tmp), args.repeat)})
+        for jobs in args.jobs:
+            # Every worker count must render the same tree as the legacy walker
+            if generate_file_structure.generate_tree(tmp, jobs=jobs) != expected:
+                raise AssertionError(f"tree walker with {jobs} jobs differs from the legacy output")
+            results.append({'benchmark': 'tree', 'variant': f"scandir/jobs={jobs}", 'docs': entries,
+                            'seconds': time_call(lambda: generate_file_structure.generate_tree(tmp, jobs=jobs),
+                                                 args.repeat)})
+
+        # Rerun against a saved snapshot of the unchanged tree, dated so its listings can be reused
+        old = time.time() - 60
+        for path, _, _ in os.walk(tmp):
+            os.utime(path, (old, old))
+        snapshot_path = os.path.join(workdir, 'snapshot.json')
+        snapshot = generate_file_structure.TreeSnapshot(snapshot_path, tmp, {})
+        generate_file_structure.generate_tree(tmp, snapshot=snapshot)
+        snapshot.save()
+        def rerun():
+            snapshot = generate_file_structure.TreeSnapshot.load(snapshot_path, tmp, {})
+            return generate_file_structure.generate_tree(tmp, snapshot=snapshot)
+        if rerun() != expected:
+            raise AssertionError("tree walker with a snapshot differs from the legacy output")
+        results.append({'benchmark': 'tree', 'variant': 'snapshot/unchanged', 'docs': entries,
+                        'seconds': time_call(rerun, args.repeat)})
+    return results
+
+BENCHMARKS = {
+    'corpus': bench_corpus,
+    'front-matter': bench_front_matter,
+    'graph': bench_graph,
+    'jobs': bench_jobs,
+    'startup': bench_startup,
+    'tree': bench_tree,
+    'yaml': bench_yaml,
+}
+
+def run_metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    """Describe the commit, interpreter and options a set of results was measured with."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'options': {key: value for key, value in vars(args).items()
+                    if key not in ('output', 'compare', 'generate')},
+    }
+
+def compare_results(baseline: List[Dict[str, Any]], results: List[Dict[str, Any]],
+                    max_regression: Optional[float] = None) -> bool:
+    """
+    Print each result next to the baseline measurement of the same benchmark and variant.
+    Returns False if any slowed down by more than max_regression percent.
+    """
+    previous = {(entry['benchmark'], entry['variant']): entry['seconds'] for entry in baseline}
+    ok = True
+    print(f"\n{'benchmark':<14} {'variant':<24} {'baseline':>10} {'current':>10} {'change':>8}")
+    for result in results:
+        key = (result['benchmark'], result['variant'])
+        if key not in previous:
+            continue
+        before, after = previous[key] * 1000, result['seconds'] * 1000
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ''
+        if max_regression is not None and change > max_regression:
+            flag = '  REGRESSION'
+            ok = False
+        print(f"{key[0]:<14} {key[1]:<24} {before:8.2f}ms {after:8.2f}ms {change:+7.1f}%{flag}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Documentation Control System tool")
+    parser.add_argument('benchmarks', nargs='*', metavar='BENCHMARK',
+                        help=f"Benchmarks to run: {', '.join(sorted(BENCHMARKS))} (default: all)")
+    parser.add_argument('--docs', type=int, default=200, help='Number of synthetic documents')
+    parser.add_argument('--body-kb', type=int, default=512, help='Body size of each document in KiB')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per measurement (best is reported)')
+    parser.add_argument('--graph-sizes', type=lambda v: [int(n) for n in v.split(',')],
+                        default=[1000, 10000, 100000], help='Comma-separated registry sizes for the graph benchmark')
+    parser.add_argument('--jobs', type=lambda v: [int(n) for n in v.split(',')], default=[1, 2, 4, 8],
+                        help='Comma-separated worker counts for the jobs benchmark')
+    parser.add_argument('--jobs-docs', type=int, default=2000, help='Number of documents for the jobs benchmark')
+    parser.add_argument('--startup-docs', type=int, default=1000,
+                        help='Number of documents for the startup benchmark')
+    parser.add_argument('--startup-budget-ms', type=float, default=500,
+                        help='Slowest acceptable cold start of a single subcommand')
+    parser.add_argument('--legacy-max-docs', type=int, default=500,
+                        help='Largest registry to run the legacy recursive cycle check on')
+    parser.add_argument('--tree-dirs', type=int, default=2000, help='Number of directories for the tree benchmark')
+    parser.add_argument('--tree-files', type=int, default=50, help='Files in each directory of the tree benchmark')
+    parser.add_argument('--tree-fanout', type=int, default=8, help='Subdirectories per directory in the tree benchmark')
+    
+    corpus = parser.add_argument_group('synthetic corpus', 'Shape of the project used by the corpus benchmark and --generate')
+    corpus.add_argument('--corpus-docs', type=int, default=2000, help='Number of documents')
+    corpus.add_argument('--corpus-body-kb', type=int, default=4, help='Body size of each document in KiB')
+    corpus.add_argument('--header-entries', type=int, default=5,
+                        help='change_requires entries in each front matter block, to vary its size')
+    corpus.add_argument('--fanout', type=int, default=3, help='Depends On and Affects entries per document')
+    corpus.add_argument('--all-nodes', type=int, default=1, help='Number of documents that affect ALL')
+    corpus.add_argument('--cycles', type=int, default=1, help='Number of dependency cycles to close (cycles may share documents)')
+    corpus.add_argument('--seed', type=int, default=0, help='Random seed for relationships and dates')
+    corpus.add_argument('--generate', metavar='DIR',
+                        help='Write the synthetic project to DIR and exit without benchmarking')
+    
+    parser.add_argument('--verify', action='store_true',
+                        help='Check the fast front matter parser against full YAML and exit without benchmarking')
+    parser.add_argument('--verify-samples', type=int, default=20000,
+                        help='Random front matter blocks checked by --verify, besides the fixed samples')
+    parser.add_argument('--output', metavar='FILE', help='Save results and run details as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='Compare results with a JSON file saved by --output')
+    parser.add_argument('--max-regression', type=float, metavar='PERCENT',
+                        help='With --compare, fail if any result is this much slower than the baseline')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    if args.verify:
+        return verify_yaml(args.verify_samples, args.seed)
+
+    if args.generate:
+        write_corpus(args.generate, corpus_registry(args), args.corpus_body_kb * 1024, args.header_entries, args.seed)
+        print(f"Wrote {args.corpus_docs} documents to {args.generate}")
+        return 0
+
+    results = []
+    for name in args.benchmarks or sorted(BENCHMARKS):
+        for result in BENCHMARKS[name](args):
+            print(f"{result['benchmark']:<14} {result['variant']:<24} {result['seconds'] * 1000:10.2f} ms")
+            results.append(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'run': run_metadata(args), 'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if not compare_results(baseline['results'], results, args.max_regression):
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
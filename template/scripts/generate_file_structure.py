@@ -1,68 +1,328 @@
 import os
+import re
+import json
+import time
+import glob
+import fnmatch
+import tempfile
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-EXCLUDED_DIRS = {'.git', 'node_modules', '__pycache__', '.vscode'} # Add more if needed
-EXCLUDED_FILES = {'.DS_Store'} # Add more if needed
+# Glob patterns left out of the tree unless --no-default-excludes is given
+DEFAULT_EXCLUDES = ['.git/', 'node_modules/', '__pycache__/', '.vscode/', '.DS_Store'] # Add more if needed
 
-def generate_tree(start_path, indent='', output_lines=None):
-    """Recursively generates the directory tree structure."""
-    if output_lines is None:
-        output_lines = []
+def compile_globs(patterns):
+    """Returns one regex matching any of the glob patterns, or None if there are none."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+class EntryFilter:
+    """
+    Glob-based include/exclude rules for tree entries. Patterns ending in '/' only
+    match directories. Patterns containing another '/' are matched against the path
+    relative to the root, all others against the entry name. Include patterns only
+    apply to files: directories are walked unless they are excluded. Ignore patterns
+    are matched against the relative path of files the script writes itself, and
+    are not listed in the generated document.
+    """
+
+    def __init__(self, include=(), exclude=(), ignore=()):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.ignore_rules = (None, compile_globs(list(ignore)))
+        self.include_rules = self._compile(self.include)
+        self.exclude_rules = self._compile([p for p in self.exclude if not p.endswith('/')])
+        self.exclude_dir_rules = self._compile([p for p in self.exclude if p.endswith('/')])
+
+    @staticmethod
+    def _compile(patterns):
+        """Returns (name_regex, path_regex) for the patterns, or None if there are none."""
+        if not patterns:
+            return None
+        names = []
+        paths = []
+        for pattern in patterns:
+            pattern = pattern.rstrip('/')
+            if '/' in pattern:
+                paths.append(pattern.lstrip('/'))
+            else:
+                names.append(pattern)
+        return compile_globs(names), compile_globs(paths)
+
+    @staticmethod
+    def _matches(rules, name, rel_path):
+        names, paths = rules
+        return bool((names and names.match(name)) or (paths and paths.match(rel_path)))
 
-    # Get list of items, separating dirs and files
+    def excluded(self, name, rel_path, is_dir):
+        """Returns True if the entry at rel_path should be left out of the tree."""
+        if self.ignore_rules[1] and self._matches(self.ignore_rules, name, rel_path):
+            return True
+        if self.exclude_rules and self._matches(self.exclude_rules, name, rel_path):
+            return True
+        if is_dir:
+            return bool(self.exclude_dir_rules and self._matches(self.exclude_dir_rules, name, rel_path))
+        return bool(self.include_rules and not self._matches(self.include_rules, name, rel_path))
+
+DEFAULT_FILTER = EntryFilter(exclude=DEFAULT_EXCLUDES)
+
+def links_to_ancestor(link_path, parent_path, root_path):
+    """Returns True if the symlinked directory link_path resolves to, or above, a directory on the walk down to it."""
+    target = os.path.realpath(link_path)
+    prefix = target.rstrip(os.sep) + os.sep
+    path = parent_path
+    while True:
+        real = os.path.realpath(path)
+        if real == target or real.startswith(prefix):
+            return True
+        if path == root_path or os.path.dirname(path) == path:
+            return False
+        path = os.path.dirname(path)
+
+def relative_dir(path, root_path):
+    """Returns path relative to root_path with '/' separators and a trailing '/', or '' for the root itself."""
+    rel_dir = os.path.relpath(path, root_path).replace(os.sep, '/')
+    return '' if rel_dir == '.' else rel_dir + '/'
+
+def entry_details(entry, kind):
+    """Returns the [name, type, size, mtime_ns] snapshot record of a directory entry."""
     try:
-        items = os.listdir(start_path)
+        stat = entry.stat()
+        return [entry.name, kind, stat.st_size, stat.st_mtime_ns]
     except OSError:
-        # Permission denied or other error
-        output_lines.append(f'{indent}+-- [Error reading directory]')
-        return output_lines
+        return [entry.name, kind, None, None]
+
+def list_directory(path, root_path=None, entry_filter=DEFAULT_FILTER, details=None):
+    """
+    Returns (dirs, files, leaves) for path, with sorted directory and file names
+    and the set of directories that must not be descended into, or None if path
+    cannot be read. Entry types come from the os.scandir() cache, so no extra
+    stat calls are made for regular entries unless a details list is given to
+    collect the snapshot record of each listed entry.
+    """
+    root_path = root_path or path
+    rel_dir = relative_dir(path, root_path)
+    dirs = []
+    files = []
+    leaves = set()
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if entry_filter.excluded(entry.name, rel_dir + entry.name, True):
+                            continue
+                        dirs.append(entry.name)
+                        kind = 'dir'
+                        # A symlink back up the tree would be walked forever
+                        if entry.is_symlink() and links_to_ancestor(entry.path, path, root_path):
+                            leaves.add(entry.name)
+                            kind = 'loop'
+                    elif entry.is_file() and not entry_filter.excluded(entry.name, rel_dir + entry.name, False):
+                        files.append(entry.name)
+                        kind = 'file'
+                    else:
+                        continue
+                    if details is not None:
+                        details.append(entry_details(entry, kind))
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    dirs.sort()
+    files.sort()
+    if details is not None:
+        details.sort(key=lambda record: record[0])
+    return dirs, files, leaves
+
+def default_file_mode():
+    """Returns the mode open() gives a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+class TreeSnapshot:
+    """
+    Index of every listed entry as (path, type, size, mtime), persisted between
+    runs. A directory whose mtime is unchanged since the previous run has not
+    gained, lost or renamed entries, so its previous listing is reused instead
+    of being read again; its subdirectories are still checked one by one, as
+    their own changes do not touch its mtime. Sizes and times of entries are
+    those seen when their directory was last read.
+    """
+
+    VERSION = 1
+    # Directories modified this close to the previous run may have changed
+    # again within the same mtime tick, so they are always read again
+    MTIME_SLACK_NS = 2 * 10**9
+
+    def __init__(self, path, root_path, options, previous=None):
+        self.path = path
+        self.root_path = root_path
+        self.options = options
+        self.previous = previous
+        self.started_ns = time.time_ns()
+        self.dirs = {}
+        self.reused = 0
 
-    dirs = sorted([d for d in items if os.path.isdir(os.path.join(start_path, d))
-                   and d not in EXCLUDED_DIRS])
-    files = sorted([f for f in items if os.path.isfile(os.path.join(start_path, f))
-                    and f not in EXCLUDED_FILES])
+    @classmethod
+    def load(cls, path, root_path, options):
+        """Returns a snapshot for this run, holding the previous run's index if it was taken with the same root and options."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path, root_path, options)
+        if (not isinstance(data, dict) or data.get('version') != cls.VERSION
+                or data.get('root') != root_path or data.get('options') != options):
+            return cls(path, root_path, options)
+        return cls(path, root_path, options, data)
+
+    def list_directory(self, path, entry_filter):
+        """Returns the listing of path like list_directory(), from the previous index when the directory is unchanged."""
+        rel_dir = relative_dir(path, self.root_path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        cached = self.previous['dirs'].get(rel_dir) if self.previous else None
+        if (cached and mtime is not None and cached['mtime'] == mtime
+                and mtime < self.previous['started_ns'] - self.MTIME_SLACK_NS):
+            entries = cached['entries']
+            self.reused += 1
+            dirs = [record[0] for record in entries if record[1] != 'file']
+            files = [record[0] for record in entries if record[1] == 'file']
+            leaves = {record[0] for record in entries if record[1] == 'loop'}
+            listing = (dirs, files, leaves)
+        else:
+            entries = []
+            listing = list_directory(path, self.root_path, entry_filter, entries)
+            if listing is None:
+                return None
+        self.dirs[rel_dir] = {'mtime': mtime, 'entries': entries}
+        return listing
+
+    @staticmethod
+    def _paths(dirs):
+        return {rel_dir + record[0] + ('' if record[1] == 'file' else '/')
+                for rel_dir, listing in dirs.items() for record in listing['entries']}
+
+    def diff(self):
+        """Returns (added, removed): sorted paths listed in only this run or only the previous one, directories ending in '/'."""
+        current = self._paths(self.dirs)
+        previous = self._paths(self.previous['dirs']) if self.previous else set()
+        return sorted(current - previous), sorted(previous - current)
+
+    def save(self):
+        """Writes this run's index in place of the previous one."""
+        data = {'version': self.VERSION, 'root': self.root_path, 'options': self.options,
+                'started_ns': self.started_ns, 'dirs': self.dirs}
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path),
+                                        prefix=f'.{os.path.basename(self.path)}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            # mkstemp creates the file as 0600
+            os.chmod(tmp_path, default_file_mode())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+def directory_lines(path, indent, listing, read, descend=True, max_entries=None):
+    """
+    Yields (line, child) for each entry of a directory listing, where child is the
+    (path, indent, pending read) of a subdirectory to descend into. Entries past
+    max_entries are summarized in a final "... N more" line.
+    """
+    if listing is None:
+        # Permission denied or other error
+        yield f'{indent}+-- [Error reading directory]', None
+        return
 
+    dirs, files, leaves = listing
     entries = dirs + files
+    hidden = 0
+    if max_entries is not None and len(entries) > max_entries:
+        hidden = len(entries) - max_entries
+        entries = entries[:max_entries]
+
+    # Queue the shown subdirectories up front so they are read while their siblings are rendered
+    pending = [None if not descend or d in leaves else read(os.path.join(path, d))
+               for d in dirs[:len(entries)]]
 
     for i, entry in enumerate(entries):
-        connector = '|-- ' if i < len(entries) - 1 else '+-- '
-        path = os.path.join(start_path, entry)
-        output_lines.append(f'{indent}{connector}{entry}')
+        last = i == len(entries) - 1 and not hidden
+        connector = '+-- ' if last else '|-- '
+        child = None
+        if i < len(pending) and pending[i] is not None:
+            child = (os.path.join(path, entry), indent + ('    ' if last else '|   '), pending[i])
+        yield f'{indent}{connector}{entry}', child
 
-        if entry in dirs:
-            new_indent = indent + ('|   ' if i < len(entries) - 1 else '    ')
-            generate_tree(path, new_indent, output_lines)
+    if hidden:
+        yield f'{indent}+-- ... {hidden} more', None
 
-    return output_lines
+def iter_tree(start_path, indent='', jobs=1, entry_filter=DEFAULT_FILTER, max_depth=None, max_entries=None,
+              snapshot=None):
+    """
+    Iteratively yields the directory tree lines below start_path, depth first.
+    Only max_depth levels are listed and at most max_entries entries of each
+    directory. With jobs > 1, subdirectories are read ahead on a thread pool
+    while the walker renders their siblings. Directories are listed through
+    snapshot, if given, which records them and reuses unchanged listings.
+    """
+    executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    if snapshot is not None:
+        def lister(path):
+            return snapshot.list_directory(path, entry_filter)
+    else:
+        def lister(path):
+            return list_directory(path, start_path, entry_filter)
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate a directory tree structure.')
-    parser.add_argument(
-        '--root', 
-        default='.',
-        help='The root directory to start scanning from.'
-    )
-    parser.add_argument(
-        '--output',
-        default='README-tree.md',
-        help='The output Markdown file path.'
-    )
-    args = parser.parse_args()
+    def read(path):
+        if executor is None:
+            return path
+        return executor.submit(lister, path)
 
-    root_dir = os.path.abspath(args.root)
-    output_file = os.path.abspath(args.output)
-    output_dir = os.path.dirname(output_file)
+    def result(pending):
+        if executor is None:
+            return lister(pending)
+        return pending.result()
 
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    def frame(path, frame_indent, pending, depth):
+        descend = max_depth is None or depth < max_depth
+        return directory_lines(path, frame_indent, result(pending), read, descend, max_entries), depth
+
+    try:
+        if max_depth is not None and max_depth < 1:
+            return
+        stack = [frame(start_path, indent, read(start_path), 1)]
+        while stack:
+            lines, depth = stack[-1]
+            item = next(lines, None)
+            if item is None:
+                stack.pop()
+                continue
+            line, child = item
+            yield line
+            if child is not None:
+                stack.append(frame(*child, depth + 1))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
 
-    # Generate the tree structure lines
-    tree_lines = [os.path.basename(root_dir)] # Start with the root dir name
-    tree_lines.extend(generate_tree(root_dir))
+def generate_tree(start_path, indent='', output_lines=None, jobs=1, **options):
+    """Generates the directory tree structure, appending its lines to output_lines."""
+    if output_lines is None:
+        output_lines = []
+    output_lines.extend(iter_tree(start_path, indent, jobs, **options))
+    return output_lines
 
-    # Prepare Markdown content
-    markdown_content = f"""# Project File Structure
+def write_markdown(out, root_dir, tree_lines, entry_filter):
+    """Streams the Markdown document for the tree lines to out, one line at a time."""
+    out.write(f"""# Project File Structure
 
 Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -70,14 +330,19 @@ Root: `{root_dir}`
 
 ```
 {os.path.basename(root_dir)}
-"""
-    # Use os.linesep for platform compatibility in the join
-    markdown_content += os.linesep.join(tree_lines[1:]) # Skip the repeated root name
-    markdown_content += "\n```\n"
-    
+""")
+    empty = True
+    for line in tree_lines:
+        out.write(line + '\n')
+        empty = False
+    if empty:
+        out.write('\n')
+    out.write("```\n")
+
     # Add self-reference information
     script_path = os.path.relpath(__file__, root_dir).replace('\\', '/')
-    markdown_content += f"""
+    excluded = ', '.join(f'`{p}`' for p in entry_filter.exclude) or 'none'
+    out.write(f"""
 ## How to Regenerate This Documentation
 
 This file structure documentation was generated using the `{script_path}` script. You can regenerate it at any time using the following command:
@@ -88,24 +353,169 @@ python {script_path}
 
 # Generate with custom root and output location
 python {script_path} --root /path/to/dir --output /path/to/output.md
+
+# Limit the size of the tree for very large projects
+python {script_path} --max-depth 3 --max-entries-per-dir 50
+
+# Show the entries added and removed since the last run
+python {script_path} --diff
 ```
 
+The output is only rewritten when entries were added or removed since the last run, as recorded in a snapshot file next to it.
+
 ### Excluded Items
 
-The script automatically excludes the following items:
-- Directories: {', '.join(f'`{d}`' for d in EXCLUDED_DIRS)}
-- Files: {', '.join(f'`{f}`' for f in EXCLUDED_FILES)}
+The script excludes entries matching the following patterns (patterns ending in `/` only match directories):
+- {excluded}
+""")
+    if entry_filter.include:
+        included = ', '.join(f'`{p}`' for p in entry_filter.include)
+        out.write(f"- Files not matching: {included}\n")
+    out.write("""
+To modify these exclusions, use the `--exclude` and `--include` options, or `--no-default-excludes` to drop the built-in patterns.
+""")
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a directory tree structure.')
+    parser.add_argument(
+        '--root',
+        default='.',
+        help='The root directory to start scanning from.'
+    )
+    parser.add_argument(
+        '--output',
+        default='README-tree.md',
+        help='The output Markdown file path.'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of threads reading directories ahead of the walker (default: 1).'
+    )
+    parser.add_argument(
+        '--max-depth',
+        type=int,
+        help='Only list this many levels below the root.'
+    )
+    parser.add_argument(
+        '--max-entries-per-dir',
+        type=int,
+        help='List at most this many entries of each directory, summarizing the rest as "... N more".'
+    )
+    parser.add_argument(
+        '--exclude',
+        action='append',
+        default=[],
+        metavar='PATTERN',
+        help='Glob pattern of entries to leave out (repeatable). A trailing "/" matches directories only; '
+             'patterns containing "/" match the path relative to the root.'
+    )
+    parser.add_argument(
+        '--include',
+        action='append',
+        default=[],
+        metavar='PATTERN',
+        help='Glob pattern of files to list (repeatable). When given, other files are left out.'
+    )
+    parser.add_argument(
+        '--no-default-excludes',
+        dest='default_excludes',
+        action='store_false',
+        help=f'Do not exclude the built-in patterns ({", ".join(DEFAULT_EXCLUDES)}).'
+    )
+    parser.add_argument(
+        '--snapshot',
+        help='Index of the tree kept between runs (default: .<output name>.snapshot.json next to the output).'
+    )
+    parser.add_argument(
+        '--no-snapshot',
+        action='store_true',
+        help='Rescan every directory and always rewrite the output, without reading or saving a snapshot.'
+    )
+    parser.add_argument(
+        '--diff',
+        action='store_true',
+        help='Print the entries added and removed since the last snapshot, without writing anything.'
+    )
+    args = parser.parse_args()
+
+    root_dir = os.path.abspath(args.root)
+    output_file = os.path.abspath(args.output)
+    output_dir = os.path.dirname(output_file)
+
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+
+    snapshot_file = os.path.abspath(args.snapshot or os.path.join(
+        output_dir, f'.{os.path.basename(output_file)}.snapshot.json'))
+    tmp_prefix = f'.{os.path.basename(output_file)}.'
+
+    # The output, the snapshot and the temporary files written next to them must
+    # not show up in the tree they describe, or every run would change it
+    ignore = []
+    for path, pattern in ((output_file, None), (snapshot_file, None), (output_file, tmp_prefix + '*.tmp'),
+                          (snapshot_file, f'.{os.path.basename(snapshot_file)}.*.tmp')):
+        rel_path = os.path.relpath(os.path.dirname(path) if pattern else path, root_dir)
+        if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+            continue
+        rel_path = glob.escape(rel_path.replace(os.sep, '/'))
+        if pattern:
+            rel_path = pattern if rel_path == '.' else f'{rel_path}/{pattern}'
+        ignore.append(rel_path)
+
+    excludes = (DEFAULT_EXCLUDES if args.default_excludes else []) + args.exclude
+    entry_filter = EntryFilter(args.include, excludes, ignore)
+
+    snapshot = None
+    if args.diff or not args.no_snapshot:
+        options = {'include': args.include, 'exclude': excludes,
+                   'max_depth': args.max_depth, 'max_entries_per_dir': args.max_entries_per_dir}
+        snapshot = TreeSnapshot.load(snapshot_file, root_dir, options)
+    tree_lines = iter_tree(root_dir, jobs=args.jobs, entry_filter=entry_filter, max_depth=args.max_depth,
+                           max_entries=args.max_entries_per_dir, snapshot=snapshot)
 
-To modify these exclusions, edit the `EXCLUDED_DIRS` and `EXCLUDED_FILES` sets in the script.
-"""
+    if args.diff:
+        for _ in tree_lines:
+            pass
+        added, removed = snapshot.diff()
+        if snapshot.previous is None:
+            print(f'No snapshot of this tree with these options at {snapshot.path}; every entry is new')
+        for path in added:
+            print(f'+ {path}')
+        for path in removed:
+            print(f'- {path}')
+        print(f'{len(added)} added, {len(removed)} removed')
+        return
 
-    # Write to the output file
+    # Stream the tree to a temporary file, which only replaces the output if the structure changed
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix=tmp_prefix, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                write_markdown(f, root_dir, tree_lines, entry_filter)
+            if snapshot is not None and snapshot.previous is not None and os.path.exists(output_file):
+                added, removed = snapshot.diff()
+                if not added and not removed:
+                    os.unlink(tmp_path)
+                    snapshot.save()
+                    print(f'File structure unchanged, left {output_file} as it is')
+                    return
+            try:
+                mode = os.stat(output_file).st_mode & 0o777
+            except OSError:
+                mode = default_file_mode()
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, output_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        if snapshot is not None:
+            snapshot.save()
         print(f'File structure saved to {output_file}')
     except IOError as e:
         print(f'Error writing to file {output_file}: {e}')
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for update_docs.py that run against a small project laid out in a temporary directory.
+Run with pytest, or directly with python.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import update_docs  # noqa: E402
+
+def write_doc(root, doc_id, last_updated, affects):
+    """Write docs/<doc_id>.md with front matter, returning its registry entry."""
+    path = f"docs/{doc_id}.md"
+    with open(os.path.join(root, path), 'w', encoding='utf-8') as f:
+        f.write(f"---\ndoc_id: {doc_id}\nversion: 1.0.0\nlast_updated: {last_updated}\n"
+                f"affects: [{', '.join(affects)}]\n---\n# {doc_id}\n")
+    return {'Document ID': doc_id, 'Path': path, 'Version': '1.0.0', 'Depends On': [], 'Affects': [],
+            'Change Requires': []}
+
+def test_since_scope_follows_metadata_affects():
+    # DOC-X's metadata says it affects DOC-C but the registry does not link them, so
+    # a change to DOC-C must still be checked against DOC-X, as a full validation is
+    saved = (update_docs.ROOT_DIR, update_docs.METADATA_CACHE, update_docs.DOCUMENT_REGISTRY,
+             update_docs.DOCUMENT_INDEX, update_docs.REGISTRY_GRAPH)
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, 'docs'))
+        registry = {
+            'DOC-C': write_doc(root, 'DOC-C', '2024-01-01', []),
+            'DOC-X': write_doc(root, 'DOC-X', '2024-03-01', ['DOC-C']),
+            'DOC-Y': write_doc(root, 'DOC-Y', '2024-02-01', []),
+        }
+        update_docs.ROOT_DIR, update_docs.METADATA_CACHE = root, None
+        update_docs.DOCUMENT_REGISTRY = registry
+        update_docs.DOCUMENT_INDEX = update_docs.REGISTRY_GRAPH = None
+        try:
+            index = update_docs.DocumentIndex(registry)
+            full = [issue.message for issue in update_docs.iter_propagation_issues(index)]
+            since = [issue.message for issue in update_docs.iter_propagation_issues(index, {'DOC-C'})]
+            assert any('DOC-C needs to be updated' in message for message in full), full
+            assert since == full, (since, full)
+            assert 'DOC-X' in update_docs.propagation_scope({'DOC-C'}, index)
+            assert 'DOC-Y' not in update_docs.propagation_scope({'DOC-C'}, index)
+        finally:
+            (update_docs.ROOT_DIR, update_docs.METADATA_CACHE, update_docs.DOCUMENT_REGISTRY,
+             update_docs.DOCUMENT_INDEX, update_docs.REGISTRY_GRAPH) = saved
+
+if __name__ == '__main__':
+    test_since_scope_follows_metadata_affects()
+    print('All tests passed')
@@ -7,24 +7,80 @@ checking consistency between documents, and validating document relationships.
 It supports the Documentation Control System as defined in README-Master.md.
 """
 
+import time
+
+# Taken before any other import so --profile-startup can report import time
+_PROCESS_START = time.perf_counter()
+
 import os
 import re
 import sys
 import json
 import argparse
-import datetime
-import yaml
-from pathlib import Path
-from typing import Dict, List, Set, Optional, Any, Tuple
+import itertools
+import posixpath
+from array import array
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Iterator, List, Set, Optional, Any, Tuple, NamedTuple, TextIO
 
 # Constants
 DEFAULT_CONFIG_PATH = ".dcs_config.json"
-METADATA_PATTERN = r"---\s*\n(.*?)\n\s*---"
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTER_FILE = "README-Master.md"
+CACHE_DIR = ".dcs_cache"
+METADATA_CACHE_FILE = "metadata.json"
+METADATA_CACHE_VERSION = 2
+IMPACT_INDEX_FILE = "impact.json"
+IMPACT_INDEX_VERSION = 1
+REGISTRY_SNAPSHOT_FILE = "registry.json"
+REGISTRY_SNAPSHOT_VERSION = 1
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+DEFAULT_MAX_HEADER_BYTES = 64 * 1024
+PARALLEL_PARSE_MIN_DOCUMENTS = 64
+
+# Settings that may be overridden by the config file at DEFAULT_CONFIG_PATH
+DEFAULT_CONFIG = {
+    'master_file': MASTER_FILE,
+    'cache_dir': CACHE_DIR,
+    'cache_max_entries': DEFAULT_CACHE_MAX_ENTRIES,
+    'max_header_bytes': DEFAULT_MAX_HEADER_BYTES,
+    'registry_snapshot': True,
+}
+
+# Metadata keys understood by the fast front matter parser
+DCS_METADATA_KEYS = frozenset([
+    'doc_id', 'version', 'last_updated', 'depends_on', 'affects', 'change_requires', 'updated_by',
+])
+
+# PyYAML is imported on first use by _load_yaml(): --impact, --graph and
+# warm-cache checks never parse YAML, and importing it dominates startup
+yaml = None
+_YAML_LOADER = None
+_YAML_DUMPER = None
+_YAML_RESOLVER = None
 
 # Document registry - this will be loaded from config or README-Master.md
 DOCUMENT_REGISTRY = {}
 
+# Per-run document model built from DOCUMENT_REGISTRY on first use
+DOCUMENT_INDEX = None
+
+# Compiled relationship graph for DOCUMENT_INDEX, built on first use
+REGISTRY_GRAPH = None
+
+# Parsed metadata cache - enabled by main() unless --no-cache is given
+METADATA_CACHE = None
+
+# Timing and count instrumentation - enabled by main() for --timings
+RUN_STATS = None
+
+# Upper bound on the size of a document's front matter block
+MAX_HEADER_BYTES = DEFAULT_MAX_HEADER_BYTES
+
+# Where log_* messages go; None means stdout. main() sends them to stderr when
+# --format json/ndjson owns stdout
+LOG_FILE = None
+
 # Console colors for output formatting
 class Colors:
     HEADER = '\033[95m'
@@ -37,352 +93,1563 @@ class Colors:
 
 def log_info(message: str) -> None:
     """Log informational message."""
-    print(f"{Colors.BLUE}INFO:{Colors.ENDC} {message}")
+    print(f"{Colors.BLUE}INFO:{Colors.ENDC} {message}", file=LOG_FILE)
 
 def log_success(message: str) -> None:
     """Log success message."""
-    print(f"{Colors.GREEN}SUCCESS:{Colors.ENDC} {message}")
+    print(f"{Colors.GREEN}SUCCESS:{Colors.ENDC} {message}", file=LOG_FILE)
 
 def log_warning(message: str) -> None:
     """Log warning message."""
-    print(f"{Colors.YELLOW}WARNING:{Colors.ENDC} {message}")
+    print(f"{Colors.YELLOW}WARNING:{Colors.ENDC} {message}", file=LOG_FILE)
 
 def log_error(message: str) -> None:
     """Log error message."""
-    print(f"{Colors.RED}ERROR:{Colors.ENDC} {message}")
+    print(f"{Colors.RED}ERROR:{Colors.ENDC} {message}", file=LOG_FILE)
+
+def _load_yaml() -> None:
+    """
+    Import PyYAML, preferring libyaml's C loader and dumper when PyYAML was built with it.
+    """
+    global yaml, _YAML_LOADER, _YAML_DUMPER, _YAML_RESOLVER
+    if yaml is None:
+        import yaml as yaml_module
+        _YAML_LOADER = getattr(yaml_module, 'CSafeLoader', yaml_module.SafeLoader)
+        _YAML_DUMPER = getattr(yaml_module, 'CSafeDumper', yaml_module.SafeDumper)
+        _YAML_RESOLVER = yaml_module.resolver.Resolver()
+        yaml = yaml_module
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    """Write data as JSON via a temporary file, so readers never see a partial file."""
+    import tempfile
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        # mkstemp creates the file as 0600; give it the mode open() would have
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+def _write_file_atomic(path: str, data: bytes) -> None:
+    """
+    Replace a file's contents via a temporary file in the same directory, keeping
+    its permission bits, so a crash never leaves a half-written document behind.
+    """
+    import tempfile
+    directory = os.path.dirname(path) or '.'
+    mode = os.stat(path).st_mode & 0o7777 if os.path.exists(path) else None
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+def load_config(config_path: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Load DCS settings from a JSON config file, relative to ROOT_DIR unless absolute.
+    Missing settings, or a missing file, fall back to DEFAULT_CONFIG.
+    Returns the merged settings.
+    """
+    config = dict(DEFAULT_CONFIG)
+    path = os.path.join(ROOT_DIR, config_path)
+    if not os.path.exists(path):
+        return config
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+    except (OSError, ValueError) as e:
+        log_warning(f"Ignoring unreadable config {config_path}: {str(e)}")
+        return config
+    
+    if not isinstance(overrides, dict):
+        log_warning(f"Ignoring config {config_path}: expected a JSON object")
+        return config
+    
+    for key, value in overrides.items():
+        if key not in DEFAULT_CONFIG:
+            log_warning(f"Ignoring unknown config setting '{key}' in {config_path}")
+            continue
+        config[key] = value
+    return config
+
+def parse_registry_table(lines: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str], Optional[str]]:
+    """
+    Parse the Document Registry table from the lines of the master document.
+    Scanning stops at the end of the table, so the rest of the file is never read.
+    Returns (registry, warnings, error_message).
+    """
+    rows = []
+    in_section = False
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not in_section:
+            in_section = line.startswith('### Document Registry')
+            continue
+        if line.startswith('#'):
+            break
+        if line.startswith('|') and line.endswith('|') and len(line) > 2:
+            rows.append(line[1:-1])
+        elif rows:
+            break
+    
+    if not in_section:
+        return {}, [], f"Could not find Document Registry section in {MASTER_FILE}"
+    if len(rows) < 3:  # Header + separator + at least one entry
+        return {}, [], "Document Registry table is empty or malformed"
+    
+    # Parse header to get column indices
+    headers = [h.strip() for h in rows[0].split('|')]
+    registry = {}
+    warnings = []
+    
+    # Skip the separator row (row[1])
+    for row in rows[2:]:
+        values = [v.strip() for v in row.split('|')]
+        if len(values) != len(headers):
+            warnings.append(f"Skipping malformed row: {row}")
+            continue
+            
+        doc_data = {headers[i]: values[i] for i in range(len(headers))}
+        doc_id = doc_data.get('Document ID')
+        if doc_id:
+            # Convert comma-separated strings to lists
+            for field in ['Depends On', 'Affects', 'Change Requires']:
+                if field in doc_data and doc_data[field] != '-':
+                    doc_data[field] = [item.strip() for item in doc_data[field].split(',')]
+                else:
+                    doc_data[field] = []
+                    
+            registry[doc_id] = doc_data
+    
+    return registry, warnings, None
+
+def _is_registry_snapshot(snapshot: Any) -> bool:
+    """Return True if snapshot has the version, fields and types that the registry snapshot is written with."""
+    return (isinstance(snapshot, dict)
+            and snapshot.get('version') == REGISTRY_SNAPSHOT_VERSION
+            and all(isinstance(snapshot.get(field), int) and not isinstance(snapshot.get(field), bool)
+                    for field in ('mtime_ns', 'size'))
+            and isinstance(snapshot.get('sha256'), str)
+            and isinstance(snapshot.get('registry'), dict)
+            and all(isinstance(data, dict) for data in snapshot['registry'].values())
+            and isinstance(snapshot.get('warnings'), list)
+            and all(isinstance(warning, str) for warning in snapshot['warnings']))
 
-def extract_document_registry_from_master() -> Dict[str, Dict[str, Any]]:
+def extract_document_registry_from_master(use_snapshot: bool = False, rebuild: bool = False) -> Dict[str, Dict[str, Any]]:
     """
     Extract document registry from README-Master.md file.
+    With use_snapshot, the parsed registry is saved in CACHE_DIR and reused for
+    as long as the master file's stat or content hash is unchanged.
     Returns a dictionary of document metadata.
     """
-    master_path = os.path.join(ROOT_DIR, "README-Master.md")
-    registry = {}
+    master_path = os.path.join(ROOT_DIR, MASTER_FILE)
+    snapshot_path = os.path.join(ROOT_DIR, CACHE_DIR, REGISTRY_SNAPSHOT_FILE)
     
     try:
-        with open(master_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find the registry table in the Document Control System section
-        registry_section = re.search(r"### Document Registry.*?\|(.*?)\|.*?(?=###|$)", 
-                                   content, re.DOTALL)
-        
-        if not registry_section:
-            log_error("Could not find Document Registry section in README-Master.md")
-            return {}
-            
-        registry_text = registry_section.group(0)
-        
-        # Parse the table rows
-        rows = re.findall(r"^\|(.+?)\|$", registry_text, re.MULTILINE)
-        if not rows or len(rows) < 3:  # Header + separator + at least one entry
-            log_error("Document Registry table is empty or malformed")
-            return {}
+        if not use_snapshot:
+            with open(master_path, 'r', encoding='utf-8') as f:
+                registry, warnings, error = parse_registry_table(f)
+        else:
+            stat_result = os.stat(master_path)
+            snapshot = None
+            if not rebuild:
+                try:
+                    with open(snapshot_path, 'r', encoding='utf-8') as f:
+                        snapshot = json.load(f)
+                except (OSError, ValueError):
+                    pass
+            if not _is_registry_snapshot(snapshot):
+                # A missing, stale or malformed snapshot is rebuilt from the master file
+                snapshot = None
             
-        # Parse header to get column indices
-        headers = [h.strip() for h in rows[0].split('|')]
-        
-        # Skip the separator row (row[1])
-        for row in rows[2:]:
-            values = [v.strip() for v in row.split('|')]
-            if len(values) != len(headers):
-                log_warning(f"Skipping malformed row: {row}")
-                continue
+            if (snapshot is not None and snapshot['mtime_ns'] == stat_result.st_mtime_ns
+                    and snapshot['size'] == stat_result.st_size):
+                registry, warnings, error = snapshot['registry'], snapshot['warnings'], None
+            else:
+                import hashlib
+                with open(master_path, 'rb') as f:
+                    raw = f.read()
+                digest = hashlib.sha256(raw).hexdigest()
+                if snapshot is not None and snapshot['sha256'] == digest:
+                    registry, warnings, error = snapshot['registry'], snapshot['warnings'], None
+                else:
+                    registry, warnings, error = parse_registry_table(
+                        raw.decode('utf-8').splitlines())
                 
-            doc_data = {headers[i]: values[i] for i in range(len(headers))}
-            doc_id = doc_data.get('Document ID')
-            if doc_id:
-                # Convert comma-separated strings to lists
-                for field in ['Depends On', 'Affects', 'Change Requires']:
-                    if field in doc_data and doc_data[field] != '-':
-                        doc_data[field] = [item.strip() for item in doc_data[field].split(',')]
-                    else:
-                        doc_data[field] = []
-                        
-                registry[doc_id] = doc_data
+                if not error:
+                    try:
+                        _write_json_atomic(snapshot_path, {
+                            'version': REGISTRY_SNAPSHOT_VERSION,
+                            'mtime_ns': stat_result.st_mtime_ns,
+                            'size': stat_result.st_size,
+                            'sha256': digest,
+                            'registry': registry,
+                            'warnings': warnings,
+                        })
+                    except Exception as e:
+                        log_warning(f"Could not write registry snapshot {snapshot_path}: {str(e)}")
     
     except Exception as e:
         log_error(f"Error extracting document registry: {str(e)}")
         return {}
     
+    for warning in warnings:
+        log_warning(warning)
+    if error:
+        log_error(error)
+        return {}
+    
     return registry
 
-def extract_metadata(file_path: str) -> Dict[str, Any]:
+def _encode_cache_value(value: Any) -> Any:
+    """Convert parsed metadata into a JSON-serializable structure."""
+    import datetime
+    if isinstance(value, datetime.datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, dict):
+        return {str(k): _encode_cache_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_cache_value(v) for v in value]
+    return value
+
+def _decode_cache_value(value: Any) -> Any:
+    """Rebuild parsed metadata from its cached JSON structure."""
+    if isinstance(value, dict):
+        if len(value) == 1 and '__datetime__' in value:
+            import datetime
+            return datetime.datetime.fromisoformat(value['__datetime__'])
+        if len(value) == 1 and '__date__' in value:
+            import datetime
+            return datetime.date.fromisoformat(value['__date__'])
+        return {k: _decode_cache_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode_cache_value(v) for v in value]
+    return value
+
+def _is_cache_entry(entry: Any) -> bool:
+    """Return True if entry has the fields and types that MetadataCache.store writes."""
+    return (isinstance(entry, dict)
+            and all(isinstance(entry.get(field), int) and not isinstance(entry.get(field), bool)
+                    for field in ('mtime_ns', 'size'))
+            and isinstance(entry.get('sha256'), str)
+            and isinstance(entry.get('metadata'), dict)
+            and (entry.get('error') is None or isinstance(entry.get('error'), str)))
+
+class MetadataCache:
     """
-    Extract metadata from a markdown file.
-    Returns a dictionary of metadata values or empty dict if not found.
+    On-disk cache of parsed document metadata.
+    Entries are keyed by path and validated against mtime and size first, then
+    against a SHA-256 of the metadata block, so only changed files are re-parsed.
+    The least recently used entries are evicted beyond max_entries.
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        match = re.search(METADATA_PATTERN, content, re.DOTALL)
-        if not match:
-            return {}
-            
-        # Extract YAML-formatted metadata
-        metadata_text = match.group(1)
+
+    def __init__(self, cache_path: str, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> None:
+        """Load cache entries from disk, ignoring missing or stale cache files."""
         try:
-            metadata = yaml.safe_load(metadata_text)
-            return metadata if metadata else {}
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get('version') != METADATA_CACHE_VERSION:
+            return
+
+        entries = data.get('entries')
+        if not isinstance(entries, list):
+            return
+        for item in entries:
+            # A malformed entry is dropped, so its file is simply parsed again
+            if isinstance(item, list) and len(item) == 2 and isinstance(item[0], str) and _is_cache_entry(item[1]):
+                self.entries[item[0]] = item[1]
+
+    def save(self) -> None:
+        """Write the cache to disk atomically if it has changed."""
+        if not self.dirty:
+            return
+
+        data = {'version': METADATA_CACHE_VERSION, 'entries': list(self.entries.items())}
+        try:
+            _write_json_atomic(self.cache_path, data)
+            self.dirty = False
         except Exception as e:
-            log_error(f"Error parsing metadata in {file_path}: {str(e)}")
-            return {}
+            log_warning(f"Could not write metadata cache {self.cache_path}: {str(e)}")
+
+    def clear(self) -> None:
+        """Drop all entries so the cache is rebuilt from scratch."""
+        self.entries.clear()
+        self.dirty = True
+
+    def _key(self, file_path: str) -> str:
+        path = os.path.abspath(file_path)
+        if path.startswith(ROOT_DIR + os.sep):
+            path = os.path.relpath(path, ROOT_DIR)
+        return path.replace(os.sep, '/')
+
+    def _touch(self, key: str) -> None:
+        # Recency only matters for eviction, so a warm run that changed nothing
+        # else rewrites the cache only once it is full
+        if next(reversed(self.entries)) != key:
+            self.entries.move_to_end(key)
+            if len(self.entries) >= self.max_entries:
+                self.dirty = True
+
+    def lookup_stat(self, file_path: str, stat_result: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Return the cached entry if the file's mtime and size are unchanged."""
+        key = self._key(file_path)
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == stat_result.st_mtime_ns and entry['size'] == stat_result.st_size:
+            self._touch(key)
+            self.hits += 1
+            return entry
+        return None
+
+    def lookup_hash(self, file_path: str, stat_result: os.stat_result, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry if the content hash is unchanged, refreshing its stat."""
+        key = self._key(file_path)
+        entry = self.entries.get(key)
+        if entry and entry['sha256'] == digest:
+            entry['mtime_ns'] = stat_result.st_mtime_ns
+            entry['size'] = stat_result.st_size
+            self.entries.move_to_end(key)
+            self.dirty = True
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, file_path: str, stat_result: os.stat_result, digest: str,
+              metadata: Dict[str, Any], error: Optional[str] = None) -> None:
+        """Record the parse result for a file, evicting least recently used entries."""
+        key = self._key(file_path)
+        self.entries[key] = {
+            'mtime_ns': stat_result.st_mtime_ns,
+            'size': stat_result.st_size,
+            'sha256': digest,
+            'metadata': _encode_cache_value(metadata),
+            'error': error,
+        }
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.dirty = True
+
+class FrontMatter(NamedTuple):
+    """Location and content of a document's leading metadata block."""
+    text: Optional[str]
+    start: int
+    end: int
+
+def read_front_matter(file_path: str, max_header_bytes: Optional[int] = None) -> FrontMatter:
+    """
+    Read the leading '---' delimited metadata block of a document.
+    Reading stops at the closing delimiter, so the document body is never loaded.
+    Returns a FrontMatter whose text is None if the document has no metadata block;
+    start and end are the byte offsets of the block including its delimiters.
+    Raises ValueError if the block exceeds max_header_bytes.
+    """
+    if max_header_bytes is None:
+        max_header_bytes = MAX_HEADER_BYTES
+
+    with open(file_path, 'rb') as f:
+        # Skip a byte order mark and blank lines before the opening delimiter
+        start = 3 if f.read(3) == b'\xef\xbb\xbf' else 0
+        f.seek(start)
+        line = f.readline(max_header_bytes + 1)
+        while line and not line.strip():
+            start = f.tell()
+            line = f.readline(max_header_bytes + 1)
+
+        if line.strip() != b'---':
+            return FrontMatter(None, 0, 0)
+
+        lines = []
+        consumed = len(line)
+        while True:
+            line = f.readline(max_header_bytes - consumed + 1)
+            consumed += len(line)
+            if consumed > max_header_bytes:
+                raise ValueError(f"metadata block exceeds {max_header_bytes} bytes")
+            if not line:
+                # No closing delimiter, so this is not a metadata block
+                return FrontMatter(None, 0, 0)
+            if line.strip() == b'---':
+                break
+            lines.append(line)
+
+        text = b''.join(lines).decode('utf-8')
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return FrontMatter(text[:-1] if text.endswith('\n') else text, start, f.tell())
+
+_METADATA_LINE = re.compile(r"([a-z_]+):(?: +(.*))?$")
+_SEQUENCE_ITEM = re.compile(r"( *)- +(.*)$")
+_ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})$")
+_PLAIN_INDICATORS = frozenset('-?:,[]{}#&*!|>\'"%@`')
+_YAML_STR_TAG = 'tag:yaml.org,2002:str'
+_YAML_TIMESTAMP_TAG = 'tag:yaml.org,2002:timestamp'
+
+class _Unrecognized(Exception):
+    """Raised by the fast metadata parser for input it leaves to full YAML."""
+
+def _parse_scalar(value: str, in_flow: bool = False) -> Any:
+    """
+    Parse a single-line YAML scalar restricted to strings and ISO dates.
+    Raises _Unrecognized for anything PyYAML might interpret differently.
+    """
+    if len(value) >= 2 and value[0] == value[-1] == "'" and "'" not in value[1:-1]:
+        return value[1:-1]
+    if len(value) >= 2 and value[0] == value[-1] == '"' and not set('"\\').intersection(value[1:-1]):
+        return value[1:-1]
     
-    except Exception as e:
-        log_error(f"Error reading file {file_path}: {str(e)}")
-        return {}
+    if (not value or value[0] in _PLAIN_INDICATORS or ': ' in value or value.endswith(':')
+            or (in_flow and set(',[]{}?:').intersection(value))):
+        raise _Unrecognized(value)
+    
+    tag = _YAML_RESOLVER.resolve(yaml.ScalarNode, value, (True, False))
+    if tag == _YAML_STR_TAG:
+        return value
+    date_match = _ISO_DATE.match(value)
+    if tag == _YAML_TIMESTAMP_TAG and date_match:
+        import datetime
+        try:
+            return datetime.date(*(int(part) for part in date_match.groups()))
+        except ValueError:
+            raise _Unrecognized(value)
+    raise _Unrecognized(value)
 
-def update_metadata(file_path: str, metadata: Dict[str, Any]) -> bool:
+def _parse_known_metadata(metadata_text: str) -> Optional[Dict[str, Any]]:
     """
-    Update metadata in a markdown file.
-    Returns True if successful, False otherwise.
+    Parse front matter made only of the known DCS keys with plain values.
+    Handles 'key: value', flow lists ('key: [a, b]') and block lists ('- a').
+    Returns None if the block uses any other construct, so it can go to full YAML.
     """
+    if '#' in metadata_text or '\t' in metadata_text:
+        return None
+    
+    _load_yaml()
+    metadata = {}
+    lines = [line.rstrip(' ') for line in metadata_text.split('\n')]
+    lines = [line for line in lines if line]
+    i = 0
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Convert metadata to YAML
-        metadata_yaml = yaml.dump(metadata, default_flow_style=False)
-        metadata_block = f"---\n{metadata_yaml}---\n"
-        
-        # Check if metadata already exists
-        if re.search(METADATA_PATTERN, content, re.DOTALL):
-            # Replace existing metadata
-            new_content = re.sub(METADATA_PATTERN, metadata_block, content, count=1, flags=re.DOTALL)
+        while i < len(lines):
+            match = _METADATA_LINE.match(lines[i])
+            if not match or match.group(1) not in DCS_METADATA_KEYS or match.group(1) in metadata:
+                return None
+            key, value = match.groups()
+            i += 1
+            
+            if value is None:
+                # Optional block sequence on the following lines
+                items = []
+                indent = None
+                while i < len(lines):
+                    item = _SEQUENCE_ITEM.match(lines[i])
+                    if not item or (indent is not None and item.group(1) != indent):
+                        break
+                    indent = item.group(1)
+                    items.append(_parse_scalar(item.group(2)))
+                    i += 1
+                metadata[key] = items if items else None
+            elif value.startswith('['):
+                if not value.endswith(']'):
+                    return None
+                inner = value[1:-1].strip()
+                metadata[key] = [_parse_scalar(item.strip(), in_flow=True)
+                                 for item in inner.split(',')] if inner else []
+            else:
+                metadata[key] = _parse_scalar(value)
+    except _Unrecognized:
+        return None
+    
+    return metadata
+
+def _parse_metadata_text(metadata_text: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Parse a YAML-formatted metadata block.
+    Blocks using only the known DCS keys take a fast path; anything else is
+    parsed with the full (libyaml-backed when available) safe loader.
+    Returns (metadata, error_message); metadata is empty if the block is empty or invalid.
+    """
+    metadata = _parse_known_metadata(metadata_text)
+    if metadata is not None:
+        return metadata, None
+    
+    try:
+        _load_yaml()
+        metadata = yaml.load(metadata_text, Loader=_YAML_LOADER)
+        return (metadata if metadata else {}), None
+    except Exception as e:
+        return {}, str(e)
+
+def _read_front_matter_safe(file_path: str) -> Tuple[Optional[FrontMatter], Optional[str]]:
+    """Read a document's front matter, returning (front_matter, error_message)."""
+    try:
+        return read_front_matter(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+def _parallel_map(func, items: List[Any], jobs: int, processes: bool = False) -> List[Any]:
+    """
+    Apply func to items, preserving order, over a pool of jobs workers.
+    Threads suit I/O-bound work; processes suit CPU-bound work such as YAML parsing.
+    Falls back to a plain loop when there is nothing to parallelize.
+    """
+    if jobs <= 1 or len(items) < 2:
+        return [func(item) for item in items]
+    
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    if processes:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(func, items, chunksize=max(1, len(items) // (jobs * 4))))
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(func, items))
+
+def _call_timed(func, item: Any) -> Tuple[Any, float]:
+    """Call func(item), returning (result, wall_seconds)."""
+    start = time.perf_counter()
+    result = func(item)
+    return result, time.perf_counter() - start
+
+def _timed_map(phase: str, func, items: List[Any], paths: List[str], jobs: int,
+               processes: bool = False) -> List[Any]:
+    """
+    _parallel_map() that, when RUN_STATS is enabled, adds the elapsed time to phase
+    and the time spent on each item to the document at the matching path.
+    """
+    stats = RUN_STATS
+    if stats is None:
+        return _parallel_map(func, items, jobs, processes)
+    
+    import functools
+    start = time.perf_counter()
+    timed = _parallel_map(functools.partial(_call_timed, func), items, jobs, processes)
+    stats.add_time(phase, time.perf_counter() - start)
+    stats.count(phase, len(items))
+    for path, (_, seconds) in zip(paths, timed):
+        stats.add_document_time(path, seconds)
+    return [result for result, _ in timed]
+
+def extract_metadata_batch(files: List[Tuple[str, Optional[os.stat_result]]], jobs: int = 1) -> List[Dict[str, Any]]:
+    """
+    Extract metadata from many markdown files, given as (file_path, stat_result) pairs.
+    With jobs > 1, front matter is read on a thread pool and large batches of YAML
+    are parsed on a process pool. Results and error messages are always produced in
+    input order, so output is identical to extracting each file in turn.
+    Returns a list of metadata dictionaries, empty where none was found.
+    """
+    cache = METADATA_CACHE
+    count = len(files)
+    entries = [None] * count
+    errors = [None] * count
+    stats = [stat_result for _, stat_result in files]
+    
+    # Unchanged files are answered from the cache without being opened
+    pending = []
+    for i, (file_path, stat_result) in enumerate(files):
+        if cache is not None:
+            try:
+                if stat_result is None:
+                    stats[i] = stat_result = os.stat(file_path)
+            except OSError as e:
+                errors[i] = ('read', str(e))
+                continue
+            entries[i] = cache.lookup_stat(file_path, stat_result)
+            if entries[i] is not None:
+                continue
+        pending.append(i)
+    
+    paths = [files[i][0] for i in pending]
+    headers = _timed_map('read', _read_front_matter_safe, paths, paths, jobs)
+    
+    to_parse = []
+    digests = {}
+    results = [None] * count
+    if cache is not None and headers:
+        import hashlib
+    for i, (front_matter, error) in zip(pending, headers):
+        if error:
+            errors[i] = ('read', error)
+            continue
+        if cache is not None:
+            # Metadata depends only on the header, so only the header is hashed
+            digests[i] = hashlib.sha256((front_matter.text or '').encode('utf-8')).hexdigest()
+            entries[i] = cache.lookup_hash(files[i][0], stats[i], digests[i])
+            if entries[i] is not None:
+                continue
+        if front_matter.text is None:
+            results[i] = ({}, None)
         else:
-            # Add metadata at the beginning of the file
-            new_content = metadata_block + content
+            to_parse.append((i, front_matter.text))
+    
+    use_processes = len(to_parse) >= PARALLEL_PARSE_MIN_DOCUMENTS
+    if to_parse:
+        # Import PyYAML once up front, so workers forked from here inherit it and
+        # --timings does not charge the import to the first document parsed
+        start = time.perf_counter()
+        _load_yaml()
+        if RUN_STATS is not None:
+            RUN_STATS.add_time('parse', time.perf_counter() - start)
+    parsed = _timed_map('parse', _parse_metadata_text, [text for _, text in to_parse],
+                        [files[i][0] for i, _ in to_parse], jobs, use_processes)
+    for (i, _), result in zip(to_parse, parsed):
+        results[i] = result
+    
+    metadata_list = []
+    for i, (file_path, _) in enumerate(files):
+        if errors[i]:
+            log_error(f"Error reading file {file_path}: {errors[i][1]}")
+            metadata_list.append({})
+            continue
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-            
-        return True
+        if entries[i] is not None:
+            metadata, error = _decode_cache_value(entries[i]['metadata']), entries[i]['error']
+        else:
+            metadata, error = results[i]
+            if cache is not None:
+                cache.store(file_path, stats[i], digests[i], metadata, error)
+        if error:
+            log_error(f"Error parsing metadata in {file_path}: {error}")
+        metadata_list.append(metadata)
     
+    return metadata_list
+
+def extract_metadata(file_path: str, stat_result: Optional[os.stat_result] = None) -> Dict[str, Any]:
+    """
+    Extract metadata from a markdown file.
+    A stat_result already taken by the caller saves the cache a second stat call.
+    Returns a dictionary of metadata values or empty dict if not found.
+    """
+    return extract_metadata_batch([(file_path, stat_result)])[0]
+
+class MetadataUpdate(NamedTuple):
+    """Outcome of rewriting one document's metadata block."""
+    file_path: str
+    status: str  # 'updated', 'unchanged' or 'error'
+    diff: Optional[str] = None
+    error: Optional[str] = None
+
+def rewrite_metadata(file_path: str, metadata: Dict[str, Any], dry_run: bool = False) -> MetadataUpdate:
+    """
+    Replace the metadata block of a markdown file, or add one at the beginning.
+    The file is left untouched when the serialized block is byte-identical, and is
+    otherwise replaced atomically. With dry_run nothing is written and the update
+    carries a unified diff of the change instead.
+    Returns a MetadataUpdate describing what happened.
+    """
+    try:
+        front_matter = read_front_matter(file_path)
+        with open(file_path, 'rb') as f:
+            header = f.read(front_matter.end)
+            prefix = header[:front_matter.start]
+
+            # Convert metadata to YAML
+            _load_yaml()
+            metadata_yaml = yaml.dump(metadata, Dumper=_YAML_DUMPER, default_flow_style=False)
+            new_header = prefix + f"---\n{metadata_yaml}---\n".encode('utf-8')
+            if new_header == header:
+                return MetadataUpdate(file_path, 'unchanged')
+
+            if dry_run:
+                import difflib
+                relative_path = os.path.relpath(file_path, ROOT_DIR)
+                diff = ''.join(difflib.unified_diff(
+                    header.decode('utf-8').splitlines(True), new_header.decode('utf-8').splitlines(True),
+                    f"a/{relative_path}", f"b/{relative_path}"))
+                return MetadataUpdate(file_path, 'updated', diff=diff)
+
+            body = f.read()
+
+        _write_file_atomic(file_path, new_header + body)
+        return MetadataUpdate(file_path, 'updated')
+
     except Exception as e:
-        log_error(f"Error updating metadata in {file_path}: {str(e)}")
+        return MetadataUpdate(file_path, 'error', error=str(e))
+
+def update_metadata(file_path: str, metadata: Dict[str, Any]) -> bool:
+    """
+    Update metadata in a markdown file.
+    Returns True if successful, False otherwise.
+    """
+    result = rewrite_metadata(file_path, metadata)
+    if result.status == 'error':
+        log_error(f"Error updating metadata in {file_path}: {result.error}")
         return False
+    return True
 
-def check_document_consistency() -> Tuple[bool, List[str]]:
+def normalize_id_list(value: Any) -> List[str]:
     """
-    Check consistency between documents based on registry.
-    Returns (is_consistent, list_of_issues).
+    Normalize a registry relationship value (Depends On, Affects, Change Requires).
+    Returns a list of entries with '-' placeholders removed.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    return [item for item in value if item != '-']
+
+_UNSET = object()
+
+class DocumentRecord:
+    """
+    A registry entry together with its file state and normalized relationships.
+    File state and metadata are loaded on first access and then memoized.
+    """
+
+    def __init__(self, doc_id: str, doc_data: Dict[str, Any]):
+        self.doc_id = doc_id
+        self.data = doc_data
+        self.path = doc_data.get('Path') or None
+        self.file_path = os.path.join(ROOT_DIR, self.path) if self.path else None
+        self.depends_on = normalize_id_list(doc_data.get('Depends On', []))
+        affects = normalize_id_list(doc_data.get('Affects', []))
+        self.affects = [aff_id for aff_id in affects if aff_id.upper() != 'ALL']
+        self.affects_all = len(self.affects) != len(affects)
+        self.change_requires = normalize_id_list(doc_data.get('Change Requires', []))
+        self._stat = _UNSET
+        self._metadata = None
+
+    @property
+    def stat(self) -> Optional[os.stat_result]:
+        """The file's stat result, or None if it has no path or does not exist."""
+        if self._stat is _UNSET:
+            try:
+                self._stat = os.stat(self.file_path) if self.file_path else None
+            except OSError:
+                self._stat = None
+        return self._stat
+
+    @property
+    def exists(self) -> bool:
+        return self.stat is not None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """The document's parsed metadata, or an empty dict if unavailable."""
+        if self._metadata is None:
+            self._metadata = extract_metadata(self.file_path, self.stat) if self.exists else {}
+        return self._metadata
+
+    def invalidate(self) -> None:
+        """Forget file state and metadata, e.g. after the file was rewritten."""
+        self._stat = _UNSET
+        self._metadata = None
+
+class DocumentIndex:
+    """
+    In-memory model of the document registry shared by all DCS commands.
+    Each document's path is resolved once and its file is read at most once
+    per invocation, however many relationships refer to it.
+    """
+
+    def __init__(self, registry: Dict[str, Dict[str, Any]]):
+        self.registry = registry
+        self.records = {doc_id: DocumentRecord(doc_id, doc_data)
+                        for doc_id, doc_data in registry.items()}
+        self._paths = None
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.records
+
+    def __iter__(self):
+        return iter(self.records.values())
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, doc_id: str) -> Optional[DocumentRecord]:
+        return self.records.get(doc_id)
+
+    def preload(self, jobs: int = 1, doc_ids: Optional[Set[str]] = None) -> None:
+        """
+        Stat and extract metadata for all documents (or just doc_ids) in one batch,
+        fanning the work out over jobs workers. Results match lazy loading exactly.
+        """
+        records = [record for record in self
+                   if record._metadata is None and (doc_ids is None or record.doc_id in doc_ids)]
+        start = time.perf_counter()
+        _parallel_map(lambda record: record.stat, records, jobs)
+        if RUN_STATS is not None:
+            RUN_STATS.add_time('stat', time.perf_counter() - start)
+            RUN_STATS.count('stat', len(records))
+        
+        records = [record for record in records if record.exists]
+        files = [(record.file_path, record.stat) for record in records]
+        for record, metadata in zip(records, extract_metadata_batch(files, jobs)):
+            record._metadata = metadata
+
+    def resolve(self, item: str) -> Optional[str]:
+        """
+        Map a document ID or a file path to a document ID.
+        Paths may be relative to ROOT_DIR or to the working directory, or absolute.
+        Returns None if the item matches no registered document.
+        """
+        if item in self.records:
+            return item
+        if self._paths is None:
+            self._paths = {posixpath.normpath(record.path.replace('\\', '/')): record.doc_id
+                           for record in self if record.path}
+        doc_id = self._paths.get(posixpath.normpath(item.replace('\\', '/')))
+        if doc_id is None:
+            relative = os.path.relpath(os.path.abspath(item), ROOT_DIR)
+            doc_id = self._paths.get(relative.replace(os.sep, '/'))
+        return doc_id
+
+def get_document_index() -> DocumentIndex:
+    """
+    Return the document index for the current DOCUMENT_REGISTRY, building it on first use.
+    """
+    global DOCUMENT_INDEX
+    if DOCUMENT_INDEX is None or DOCUMENT_INDEX.registry is not DOCUMENT_REGISTRY:
+        DOCUMENT_INDEX = DocumentIndex(DOCUMENT_REGISTRY)
+    return DOCUMENT_INDEX
+
+def _compile_edges(adjacency: List[List[int]]) -> Tuple[array, array]:
+    """
+    Pack per-node target lists into compressed sparse row form.
+    Returns (offsets, targets); node n's targets are targets[offsets[n]:offsets[n + 1]].
+    """
+    offsets = array('l', [0])
+    targets = array('l')
+    for node_targets in adjacency:
+        targets.extend(node_targets)
+        offsets.append(len(targets))
+    return offsets, targets
+
+class RegistryGraph:
+    """
+    Registry relationships compiled into integer-indexed adjacency arrays.
+    Registered documents occupy node IDs [0, registered) in registry order;
+    IDs referenced by relationships but missing from the registry follow them.
+    All traversals are iterative, so deep registries cannot exhaust the stack.
+    """
+
+    def __init__(self, index: DocumentIndex):
+        self.index = index
+        self.ids = list(index.records)
+        self.node_of = {doc_id: node for node, doc_id in enumerate(self.ids)}
+        self.registered = len(self.ids)
+
+        depends = []
+        affects = []
+        self.affects_all = bytearray(self.registered)
+        node_of = self.node_of
+        for node, record in enumerate(index):
+            depends.append([node_of[dep_id] if dep_id in node_of else self._node(dep_id)
+                            for dep_id in record.depends_on])
+            affects.append([node_of[aff_id] if aff_id in node_of else self._node(aff_id)
+                            for aff_id in record.affects])
+            self.affects_all[node] = record.affects_all
+
+        # Unregistered documents have no relationships of their own
+        unregistered = len(self.ids) - self.registered
+        depends.extend([] for _ in range(unregistered))
+        affects.extend([] for _ in range(unregistered))
+        self.affects_all.extend(bytes(unregistered))
+
+        self.depends_offsets, self.depends_targets = _compile_edges(depends)
+        self.affects_offsets, self.affects_targets = _compile_edges(affects)
+
+    def _node(self, doc_id: str) -> int:
+        node = self.node_of.get(doc_id)
+        if node is None:
+            node = len(self.ids)
+            self.ids.append(doc_id)
+            self.node_of[doc_id] = node
+        return node
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def strongly_connected_components(self, offsets: array, targets: array) -> List[List[int]]:
+        """
+        Find strongly connected components with an iterative Tarjan's algorithm.
+        The edge arrays may describe extra nodes beyond the registry's own.
+        Returns components in reverse topological order (sinks first).
+        """
+        size = len(offsets) - 1
+        order = array('l', [-1]) * size
+        low = array('l', [0]) * size
+        on_stack = bytearray(size)
+        stack = []
+        components = []
+        counter = 0
+
+        for root in range(size):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, offsets[root])]
+
+            while work:
+                node, edge = work[-1]
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    target = targets[edge]
+                    if order[target] == -1:
+                        order[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = 1
+                        work.append((target, offsets[target]))
+                    elif on_stack[target] and order[target] < low[node]:
+                        low[node] = order[target]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def dependency_cycles(self) -> List[List[str]]:
+        """
+        Report one circular dependency per strongly connected component of Depends On edges.
+        Each cycle starts and ends at the component's first document in registry order.
+        """
+        offsets, targets = self.depends_offsets, self.depends_targets
+        cycles = []
+        for component in self.strongly_connected_components(offsets, targets):
+            start = min(component)
+            if len(component) == 1 and start not in targets[offsets[start]:offsets[start + 1]]:
+                continue
+
+            # Shortest path back to the start within the component
+            members = set(component)
+            parent = {start: None}
+            queue = deque([start])
+            last = None
+            while last is None:
+                node = queue.popleft()
+                for edge in range(offsets[node], offsets[node + 1]):
+                    target = targets[edge]
+                    if target == start:
+                        last = node
+                        break
+                    if target in members and target not in parent:
+                        parent[target] = node
+                        queue.append(target)
+
+            cycle = [start]
+            while last is not None:
+                cycle.append(last)
+                last = parent[last]
+            cycle.reverse()
+            cycles.append(cycle)
+
+        cycles.sort()
+        return [[self.ids[node] for node in cycle] for cycle in cycles]
+
+    def neighbourhood(self, doc_ids: Set[str]) -> Set[str]:
+        """
+        Return the given registered documents plus every registered document they
+        depend on, affect, or are depended on or affected by.
+        """
+        nodes = [self.node_of[doc_id] for doc_id in doc_ids if doc_id in self.node_of]
+        nodes = [node for node in nodes if node < self.registered]
+        if any(self.affects_all[node] for node in nodes):
+            return set(self.ids[:self.registered])
+
+        selected = set(nodes)
+        targets_of = [(self.depends_offsets, self.depends_targets),
+                      (self.affects_offsets, self.affects_targets)]
+        for offsets, targets in targets_of:
+            for node in nodes:
+                selected.update(targets[offsets[node]:offsets[node + 1]])
+
+        # Documents pointing at the selection, including every ALL document
+        wanted = set(nodes)
+        for offsets, targets in targets_of:
+            for source in range(self.registered):
+                if not wanted.isdisjoint(targets[offsets[source]:offsets[source + 1]]):
+                    selected.add(source)
+        selected.update(node for node in range(self.registered) if self.affects_all[node])
+
+        return {self.ids[node] for node in selected if node < self.registered}
+
+    def subgraph(self, doc_ids: Set[str], depth: Optional[int] = None) -> Set[str]:
+        """
+        Return the registered documents within depth relationship hops of doc_ids,
+        following Depends On and Affects edges in either direction (no limit if None).
+        Documents that affect ALL are adjacent to everything, so they are always
+        included, but the search only expands through them when they are roots.
+        """
+        # Undirected adjacency over explicit edges only
+        neighbours = [[] for _ in range(len(self.ids))]
+        for offsets, targets in [(self.depends_offsets, self.depends_targets),
+                                 (self.affects_offsets, self.affects_targets)]:
+            for source in range(self.registered):
+                for target in targets[offsets[source]:offsets[source + 1]]:
+                    neighbours[source].append(target)
+                    neighbours[target].append(source)
+
+        roots = [self.node_of[doc_id] for doc_id in doc_ids if doc_id in self.node_of]
+        distance = {node: 0 for node in roots}
+        queue = deque(roots)
+        while queue:
+            node = queue.popleft()
+            if depth is not None and distance[node] >= depth:
+                continue
+            successors = neighbours[node]
+            if self.affects_all[node]:
+                successors = range(self.registered)
+            for successor in successors:
+                if successor not in distance and not self.affects_all[successor]:
+                    distance[successor] = distance[node] + 1
+                    queue.append(successor)
+
+        selected = set(distance)
+        if roots and depth != 0:
+            selected.update(node for node in range(self.registered) if self.affects_all[node])
+        return {self.ids[node] for node in selected if node < self.registered}
+
+    def impact_closure(self, sources: List[int]) -> List[int]:
+        """
+        Collect every node reachable from sources over Affects edges with a breadth-first search.
+        A document that affects ALL reaches every other registered document.
+        Sources are only included if they are reachable from another source.
+        """
+        offsets, targets = self.affects_offsets, self.affects_targets
+        reached = bytearray(len(self.ids))
+        result = []
+        queue = deque(sources)
+        while queue:
+            node = queue.popleft()
+            successors = targets[offsets[node]:offsets[node + 1]]
+            if self.affects_all[node]:
+                successors.extend(other for other in range(self.registered) if other != node)
+            for target in successors:
+                if not reached[target]:
+                    reached[target] = 1
+                    result.append(target)
+                    queue.append(target)
+        return result
+
+def get_registry_graph(index: Optional[DocumentIndex] = None) -> RegistryGraph:
     """
-    issues = []
-    registry = DOCUMENT_REGISTRY
+    Return the compiled relationship graph for a document index, building it on first use.
+    """
+    global REGISTRY_GRAPH
+    if index is None:
+        index = get_document_index()
+    if REGISTRY_GRAPH is None or REGISTRY_GRAPH.index is not index:
+        REGISTRY_GRAPH = RegistryGraph(index)
+    return REGISTRY_GRAPH
+
+class ImpactIndex:
+    """
+    Precomputed transitive closure of Affects edges for answering many impact queries.
+    Closures are computed once per strongly connected component of the condensed
+    graph, stored as integer bitsets over node IDs and shared between nodes with
+    identical closures. The index is fingerprinted by the graph it was built from.
+    """
+
+    def __init__(self, fingerprint: str, ids: List[str], closures: List[int], node_closure: List[int]):
+        self.fingerprint = fingerprint
+        self.ids = ids
+        self.closures = closures
+        self.node_closure = node_closure
+
+    @staticmethod
+    def fingerprint_graph(graph: RegistryGraph) -> str:
+        import hashlib
+        digest = hashlib.sha256()
+        digest.update('\0'.join(graph.ids).encode('utf-8'))
+        digest.update(graph.registered.to_bytes(8, 'little'))
+        digest.update(graph.affects_offsets.tobytes())
+        digest.update(graph.affects_targets.tobytes())
+        digest.update(bytes(graph.affects_all))
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, graph: RegistryGraph) -> 'ImpactIndex':
+        """Compute the closure of every node in one pass over the condensed graph."""
+        size = len(graph.ids)
+        universe = size
+
+        # 'Affects: ALL' is routed through a virtual universe node linked to every
+        # registered document, so fan-out costs N edges in total rather than N per node
+        adjacency = []
+        for node in range(size):
+            targets = list(graph.affects_targets[graph.affects_offsets[node]:graph.affects_offsets[node + 1]])
+            if graph.affects_all[node]:
+                targets.append(universe)
+            adjacency.append(targets)
+        adjacency.append(list(range(graph.registered)))
+        offsets, targets = _compile_edges(adjacency)
+
+        components = graph.strongly_connected_components(offsets, targets)
+        component_of = array('l', [0]) * (size + 1)
+        for number, component in enumerate(components):
+            for node in component:
+                component_of[node] = number
+
+        # Components arrive sinks first, so successors are always complete
+        closure_of = []
+        members_of = []
+        for number, component in enumerate(components):
+            members = 0
+            for node in component:
+                members |= 1 << node
+            closure = 0
+            cyclic = len(component) > 1
+            for node in component:
+                for edge in range(offsets[node], offsets[node + 1]):
+                    successor = component_of[targets[edge]]
+                    if successor == number:
+                        cyclic = True
+                    else:
+                        closure |= closure_of[successor] | members_of[successor]
+            closure_of.append(closure | members if cyclic else closure)
+            members_of.append(members)
+
+        # Explicit in-edges decide whether an ALL document is genuinely reached from
+        # elsewhere, as the universe node makes every ALL document reach itself
+        all_count = sum(graph.affects_all)
+        referenced = bytearray(size)
+        for node in range(size):
+            for edge in range(graph.affects_offsets[node], graph.affects_offsets[node + 1]):
+                referenced[graph.affects_targets[edge]] = 1
+
+        universe_mask = ~(1 << universe)
+        closures = []
+        shared = {}
+        node_closure = []
+        for node in range(size):
+            closure = closure_of[component_of[node]] & universe_mask
+            if graph.affects_all[node] and not referenced[node] and all_count < 2:
+                closure &= ~(1 << node)
+            node_closure.append(shared.setdefault(closure, len(closures)))
+            if node_closure[-1] == len(closures):
+                closures.append(closure)
+
+        return cls(cls.fingerprint_graph(graph), list(graph.ids), closures, node_closure)
+
+    @classmethod
+    def load(cls, index_path: str, graph: RegistryGraph) -> Optional['ImpactIndex']:
+        """Load a saved index, or return None if it is missing, malformed or built from another graph."""
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (not isinstance(data, dict) or data.get('version') != IMPACT_INDEX_VERSION
+                or data.get('fingerprint') != cls.fingerprint_graph(graph)):
+            return None
+        try:
+            ids, node_closure = list(data['ids']), list(data['node_closure'])
+            closures = [int(c, 16) for c in data['closures']]
+        except (KeyError, TypeError, ValueError):
+            return None
+        # Every node must point at a closure over the graph's own nodes
+        size = len(graph.ids)
+        if (ids != list(graph.ids) or len(node_closure) != size
+                or any(type(n) is not int or not 0 <= n < len(closures) for n in node_closure)
+                or any(not 0 <= closure < 1 << size for closure in closures)):
+            return None
+        return cls(data['fingerprint'], ids, closures, node_closure)
+
+    def save(self, index_path: str) -> None:
+        """Write the index to disk atomically."""
+        data = {
+            'version': IMPACT_INDEX_VERSION,
+            'fingerprint': self.fingerprint,
+            'ids': self.ids,
+            'closures': [format(closure, 'x') for closure in self.closures],
+            'node_closure': self.node_closure,
+        }
+        try:
+            _write_json_atomic(index_path, data)
+        except Exception as e:
+            log_warning(f"Could not write impact index {index_path}: {str(e)}")
+
+    def affected(self, node: int) -> List[str]:
+        """Return the IDs affected by a node, in node order."""
+        closure = self.closures[self.node_closure[node]]
+        ids = []
+        while closure:
+            low_bit = closure & -closure
+            ids.append(self.ids[low_bit.bit_length() - 1])
+            closure ^= low_bit
+        return ids
+
+def get_impact_index(graph: RegistryGraph, use_cache: bool = True, rebuild: bool = False) -> ImpactIndex:
+    """
+    Return the impact index for a graph, reusing the one saved in CACHE_DIR when it matches.
+    """
+    index_path = os.path.join(ROOT_DIR, CACHE_DIR, IMPACT_INDEX_FILE)
+    impact_index = None
+    if use_cache and not rebuild:
+        impact_index = ImpactIndex.load(index_path, graph)
+    if impact_index is None:
+        impact_index = ImpactIndex.build(graph)
+        if use_cache:
+            impact_index.save(index_path)
+    return impact_index
+
+def analyze_impact_batch(items: List[str], index: Optional[DocumentIndex] = None,
+                         use_cache: bool = True, rebuild: bool = False,
+                         impact_index: Optional[ImpactIndex] = None) -> Dict[str, Any]:
+    """
+    Analyze the impact of changing many documents, given as IDs or file paths.
+    An impact_index already built for the index's graph is used as is.
+    Returns a JSON-serializable dict with per-document affected IDs, their union,
+    and the items that could not be mapped to a registered document.
+    """
+    if index is None:
+        index = get_document_index()
+    graph = get_registry_graph(index)
+    if impact_index is None:
+        impact_index = get_impact_index(graph, use_cache, rebuild)
+
+    documents = {}
+    unresolved = []
+    union = 0
+    for item in items:
+        doc_id = index.resolve(item)
+        if doc_id is None:
+            unresolved.append(item)
+            continue
+        if doc_id in documents:
+            continue
+        node = graph.node_of[doc_id]
+        documents[doc_id] = impact_index.affected(node)
+        union |= impact_index.closures[impact_index.node_closure[node]]
+
+    union_ids = []
+    while union:
+        low_bit = union & -union
+        union_ids.append(graph.ids[low_bit.bit_length() - 1])
+        union ^= low_bit
+
+    return {'documents': documents, 'union': union_ids, 'unresolved': unresolved}
+
+def changed_documents_since(ref: str, index: Optional[DocumentIndex] = None) -> Tuple[Set[str], bool]:
+    """
+    Find registered documents changed since a git ref, including uncommitted and untracked files.
+    Returns (changed_doc_ids, registry_changed); registry_changed is True when
+    the master document itself changed and every document needs checking.
+    Raises subprocess.CalledProcessError or OSError if git cannot be run.
+    """
+    if index is None:
+        index = get_document_index()
+
+    commands = [
+        ['git', '-C', ROOT_DIR, 'diff', '--name-only', '--relative', ref, '--'],
+        ['git', '-C', ROOT_DIR, 'ls-files', '--others', '--exclude-standard'],
+    ]
+    import subprocess
+    paths = []
+    for command in commands:
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        paths.extend(line for line in result.stdout.splitlines() if line)
+
+    changed = set()
+    registry_changed = False
+    for path in paths:
+        if path == MASTER_FILE:
+            registry_changed = True
+        doc_id = index.resolve(os.path.join(ROOT_DIR, path))
+        if doc_id is not None:
+            changed.add(doc_id)
+    return changed, registry_changed
+
+class Issue(NamedTuple):
+    """
+    A problem found by a DCS check. code identifies the kind of problem,
+    doc_id the document it is reported against and related_id the other
+    document involved, if any.
+    """
+    code: str
+    doc_id: Optional[str]
+    related_id: Optional[str]
+    severity: str
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+def iter_consistency_issues(index: Optional[DocumentIndex] = None,
+                            scope: Optional[Set[str]] = None) -> Iterator[Issue]:
+    """
+    Check consistency between documents based on registry, yielding issues as they are found.
+    If scope is given, only those document IDs (and cycles through them) are checked.
+    """
+    if index is None:
+        index = get_document_index()
+    registry = index.registry
+    records = list(index) if scope is None else [record for record in index if record.doc_id in scope]
     
     # Check that all documents exist
-    for doc_id, doc_data in registry.items():
-        doc_path = doc_data.get('Path')
+    for record in records:
+        doc_id = record.doc_id
+        doc_path = record.path
         if not doc_path:
-            issues.append(f"Document ID {doc_id} has no path in registry")
+            yield Issue('missing-path', doc_id, None, 'error', f"Document ID {doc_id} has no path in registry")
             continue
             
-        file_path = os.path.join(ROOT_DIR, doc_path)
-        if not os.path.exists(file_path):
-            issues.append(f"Document {doc_id} ({doc_path}) does not exist")
+        if not record.exists:
+            yield Issue('missing-file', doc_id, None, 'error', f"Document {doc_id} ({doc_path}) does not exist")
             continue
         
         # Check metadata consistency
-        metadata = extract_metadata(file_path)
+        metadata = record.metadata
         if not metadata:
-            issues.append(f"Document {doc_id} ({doc_path}) has no metadata")
+            yield Issue('missing-metadata', doc_id, None, 'error', f"Document {doc_id} ({doc_path}) has no metadata")
             continue
             
         if metadata.get('doc_id') != doc_id:
-            issues.append(f"Document {doc_id} has inconsistent doc_id: {metadata.get('doc_id')}")
+            yield Issue('doc-id-mismatch', doc_id, None, 'error',
+                        f"Document {doc_id} has inconsistent doc_id: {metadata.get('doc_id')}")
             
-        reg_version = doc_data.get('Version')
+        reg_version = record.data.get('Version')
         meta_version = metadata.get('version')
         if reg_version != meta_version:
-            issues.append(f"Document {doc_id} has inconsistent version: {meta_version} (metadata) vs {reg_version} (registry)")
+            yield Issue('version-mismatch', doc_id, None, 'error',
+                        f"Document {doc_id} has inconsistent version: {meta_version} (metadata) vs {reg_version} (registry)")
     
     # Check dependency relationships
-    for doc_id, doc_data in registry.items():
-        depends_on = doc_data.get('Depends On', [])
-        if isinstance(depends_on, str) and depends_on != '-':
-            depends_on = [depends_on]
-        
+    for record in records:
         # Check that dependencies exist
-        for dep_id in depends_on:
-            if dep_id != '-' and dep_id not in registry:
-                issues.append(f"Document {doc_id} depends on non-existent document {dep_id}")
+        for dep_id in record.depends_on:
+            if dep_id not in registry:
+                yield Issue('unknown-dependency', record.doc_id, dep_id, 'error',
+                            f"Document {record.doc_id} depends on non-existent document {dep_id}")
     
     # Check for circular dependencies
-    def check_circular(doc_id, visited=None, path=None):
-        if visited is None:
-            visited = set()
-        if path is None:
-            path = []
-            
-        if doc_id in path:
-            cycle_path = ' -> '.join(path + [doc_id])
-            issues.append(f"Circular dependency detected: {cycle_path}")
-            return
-            
-        if doc_id in visited:
-            return
-            
-        visited.add(doc_id)
-        path.append(doc_id)
-        
-        depends_on = registry.get(doc_id, {}).get('Depends On', [])
-        if isinstance(depends_on, str) and depends_on != '-':
-            depends_on = [depends_on]
-            
-        for dep_id in depends_on:
-            if dep_id != '-':
-                check_circular(dep_id, visited, path.copy())
-    
-    for doc_id in registry:
-        check_circular(doc_id)
-    
+    for cycle in get_registry_graph(index).dependency_cycles():
+        if scope is None or not scope.isdisjoint(cycle):
+            yield Issue('dependency-cycle', cycle[0], cycle[1] if len(cycle) > 1 else None, 'error',
+                        f"Circular dependency detected: {' -> '.join(cycle)}")
+
+def check_document_consistency(index: Optional[DocumentIndex] = None,
+                               scope: Optional[Set[str]] = None) -> Tuple[bool, List[str]]:
+    """
+    Check consistency between documents based on registry.
+    If scope is given, only those document IDs (and cycles through them) are checked.
+    Returns (is_consistent, list_of_issues).
+    """
+    issues = [issue.message for issue in iter_consistency_issues(index, scope)]
     return len(issues) == 0, issues
 
-def analyze_impact(doc_id: str) -> Set[str]:
+def analyze_impact(doc_id: str, index: Optional[DocumentIndex] = None) -> Set[str]:
     """
     Analyze the impact of changing a document.
     Returns a set of affected document IDs.
     """
-    affected = set()
-    registry = DOCUMENT_REGISTRY
+    graph = get_registry_graph(index)
+    node = graph.node_of.get(doc_id)
+    if node is None or node >= graph.registered:
+        return set()
     
-    def gather_affected(current_id):
-        if current_id not in registry:
-            return
-            
-        affected_docs = registry[current_id].get('Affects', [])
-        if isinstance(affected_docs, str):
-            if affected_docs.upper() == 'ALL':
-                # Add all documents except the current one
-                affected.update(registry.keys() - {current_id})
-            elif affected_docs != '-':
-                affected_docs = [affected_docs]
-        
-        for aff_id in affected_docs:
-            if aff_id != '-' and aff_id not in affected:
-                affected.add(aff_id)
-                gather_affected(aff_id)
-    
-    gather_affected(doc_id)
-    return affected
+    return {graph.ids[target] for target in graph.impact_closure([node])}
+
+GRAPH_FORMATS = ['text', 'dot', 'json', 'mermaid']
+
+def _dot_id(doc_id: str) -> str:
+    """Quote a document ID for use as a DOT node name."""
+    return '"' + doc_id.replace('\\', '\\\\').replace('"', '\\"') + '"'
 
-def generate_dependency_graph(output_format='text') -> str:
+def write_dependency_graph(out: TextIO, output_format: str = 'text', roots: Optional[Set[str]] = None,
+                           depth: Optional[int] = None, index: Optional[DocumentIndex] = None) -> None:
     """
-    Generate a visualization of document dependencies.
-    Returns the graph in the specified format.
+    Stream a visualization of document dependencies to out, one line at a time.
+    With roots, only documents within depth hops of them are written.
+    A document that affects ALL is drawn as a single edge to a cluster holding
+    every other document rather than one edge per document.
+    Raises ValueError for an unsupported output format.
     """
+    if output_format not in GRAPH_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    if index is None:
+        index = get_document_index()
+    records = list(index)
+    if roots is not None:
+        selected = get_registry_graph(index).subgraph(roots, depth)
+        records = [record for record in records if record.doc_id in selected]
+    
     if output_format == 'text':
-        result = "Document Dependency Graph:\n"
-        for doc_id, doc_data in DOCUMENT_REGISTRY.items():
-            result += f"\n{doc_id} ({doc_data.get('Path', 'unknown')})\n"
+        out.write("Document Dependency Graph:\n")
+        for record in records:
+            out.write(f"\n{record.doc_id} ({record.data.get('Path', 'unknown')})\n")
             
             # Display dependencies
-            depends_on = doc_data.get('Depends On', [])
-            if isinstance(depends_on, str) and depends_on != '-':
-                depends_on = [depends_on]
-                
-            if depends_on and depends_on != ['-']:
-                result += "  Depends on:\n"
-                for dep_id in depends_on:
-                    if dep_id != '-':
-                        result += f"    ↑ {dep_id}\n"
+            if record.depends_on:
+                out.write("  Depends on:\n")
+                for dep_id in record.depends_on:
+                    out.write(f"    ↑ {dep_id}\n")
             
             # Display affected documents
-            affects = doc_data.get('Affects', [])
-            if isinstance(affects, str) and affects != '-':
-                if affects.upper() == 'ALL':
-                    result += "  Affects: ALL OTHER DOCUMENTS\n"
-                else:
-                    affects = [affects]
-                    
-            if affects and affects != ['-'] and affects != 'ALL':
-                result += "  Affects:\n"
-                for aff_id in affects:
-                    if aff_id != '-':
-                        result += f"    ↓ {aff_id}\n"
+            if record.affects_all:
+                out.write("  Affects: ALL OTHER DOCUMENTS\n")
+            if record.affects:
+                out.write("  Affects:\n")
+                for aff_id in record.affects:
+                    out.write(f"    ↓ {aff_id}\n")
             
             # Display required code paths
-            requires = doc_data.get('Change Requires', [])
-            if isinstance(requires, str) and requires != '-':
-                requires = [requires]
-                
-            if requires and requires != ['-']:
-                result += "  Changes require:\n"
-                for req in requires:
-                    if req != '-':
-                        result += f"    • {req}\n"
-        
-        return result
+            if record.change_requires:
+                out.write("  Changes require:\n")
+                for req in record.change_requires:
+                    out.write(f"    • {req}\n")
+        out.write("\n")
+    
+    elif output_format == 'json':
+        # Adjacency lists, one document per line
+        out.write('{"documents": {')
+        for i, record in enumerate(records):
+            entry = {
+                'path': record.path,
+                'depends_on': record.depends_on,
+                'affects': record.affects,
+                'affects_all': record.affects_all,
+                'change_requires': record.change_requires,
+            }
+            out.write(f"{',' if i else ''}\n  {json.dumps(record.doc_id)}: {json.dumps(entry)}")
+        out.write("\n}}\n")
     
     elif output_format == 'dot':
         # Generate DOT format for Graphviz
-        lines = ['digraph DocDependencies {']
-        lines.append('  rankdir=LR;')
-        lines.append('  node [shape=box, style=filled, fillcolor=lightblue];')
+        everyone = [record for record in records if not record.affects_all]
+        out.write('digraph DocDependencies {\n')
+        out.write('  rankdir=LR;\n')
+        out.write('  node [shape=box, style=filled, fillcolor=lightblue];\n')
+        if len(everyone) < len(records) and everyone:
+            out.write('  compound=true;\n')
         
-        # Add nodes
-        for doc_id in DOCUMENT_REGISTRY:
-            lines.append(f'  "{doc_id}";')
+        # Add nodes, with the documents covered by ALL in one cluster
+        for record in records:
+            if record.affects_all:
+                out.write(f'  {_dot_id(record.doc_id)};\n')
+        if len(everyone) < len(records) and everyone:
+            out.write('  subgraph cluster_all {\n')
+            out.write('    label="ALL";\n')
+            for record in everyone:
+                out.write(f'    {_dot_id(record.doc_id)};\n')
+            out.write('  }\n')
+        else:
+            for record in everyone:
+                out.write(f'  {_dot_id(record.doc_id)};\n')
         
         # Add edges
-        for doc_id, doc_data in DOCUMENT_REGISTRY.items():
-            depends_on = doc_data.get('Depends On', [])
-            if isinstance(depends_on, str) and depends_on != '-':
-                depends_on = [depends_on]
-                
-            for dep_id in depends_on:
-                if dep_id != '-':
-                    lines.append(f'  "{dep_id}" -> "{doc_id}" [color=blue];')
-            
-            affects = doc_data.get('Affects', [])
-            if isinstance(affects, str):
-                if affects.upper() == 'ALL':
-                    # Connect to all other documents
-                    for other_id in DOCUMENT_REGISTRY:
-                        if other_id != doc_id:
-                            lines.append(f'  "{doc_id}" -> "{other_id}" [color=red];')
-                elif affects != '-':
-                    affects = [affects]
-                    
-            if isinstance(affects, list):
-                for aff_id in affects:
-                    if aff_id != '-':
-                        lines.append(f'  "{doc_id}" -> "{aff_id}" [color=red];')
-        
-        lines.append('}')
-        return '\n'.join(lines)
+        for record in records:
+            doc_id = _dot_id(record.doc_id)
+            for dep_id in record.depends_on:
+                out.write(f'  {_dot_id(dep_id)} -> {doc_id} [color=blue];\n')
+            if record.affects_all:
+                for other in records:
+                    if other.affects_all and other is not record:
+                        out.write(f'  {doc_id} -> {_dot_id(other.doc_id)} [color=red];\n')
+                if everyone:
+                    out.write(f'  {doc_id} -> {_dot_id(everyone[0].doc_id)} [color=red, lhead=cluster_all];\n')
+            for aff_id in record.affects:
+                out.write(f'  {doc_id} -> {_dot_id(aff_id)} [color=red];\n')
+        out.write('}\n')
     
-    else:
-        return f"Unsupported output format: {output_format}"
+    elif output_format == 'mermaid':
+        # Mermaid node names are generated, with the document IDs as labels
+        names = {}
+        def node(doc_id: str) -> str:
+            if doc_id not in names:
+                names[doc_id] = f"n{len(names)}"
+                label = doc_id.replace('"', '#quot;')
+                out.write(f'  {names[doc_id]}["{label}"]\n')
+            return names[doc_id]
+        
+        everyone = [record for record in records if not record.affects_all]
+        out.write('flowchart LR\n')
+        for record in records:
+            if record.affects_all:
+                node(record.doc_id)
+        if len(everyone) < len(records) and everyone:
+            out.write('  subgraph all_documents ["ALL"]\n')
+            for record in everyone:
+                node(record.doc_id)
+            out.write('  end\n')
+        else:
+            for record in everyone:
+                node(record.doc_id)
+        
+        for record in records:
+            for dep_id in record.depends_on:
+                out.write(f'  {node(dep_id)} --> {node(record.doc_id)}\n')
+            if record.affects_all:
+                for other in records:
+                    if other.affects_all and other is not record:
+                        out.write(f'  {node(record.doc_id)} -.-> {node(other.doc_id)}\n')
+                if everyone:
+                    out.write(f'  {node(record.doc_id)} -.-> all_documents\n')
+            for aff_id in record.affects:
+                out.write(f'  {node(record.doc_id)} -.-> {node(aff_id)}\n')
 
-def update_document_metadata(doc_id: str, author: str = None) -> bool:
+def generate_dependency_graph(output_format='text', roots: Optional[Set[str]] = None,
+                              depth: Optional[int] = None) -> str:
     """
-    Update the metadata of a document by its ID.
-    Returns True if successful, False otherwise.
+    Generate a visualization of document dependencies.
+    Returns the graph in the specified format.
     """
-    if doc_id not in DOCUMENT_REGISTRY:
-        log_error(f"Document ID {doc_id} not found in registry")
-        return False
-    
-    doc_data = DOCUMENT_REGISTRY[doc_id]
-    doc_path = doc_data.get('Path')
-    if not doc_path:
-        log_error(f"Document {doc_id} has no path in registry")
-        return False
-    
-    file_path = os.path.join(ROOT_DIR, doc_path)
-    if not os.path.exists(file_path):
-        log_error(f"Document file {file_path} does not exist")
-        return False
-    
-    # Extract existing metadata or create new
-    metadata = extract_metadata(file_path) or {}
+    from io import StringIO
+    buffer = StringIO()
+    try:
+        write_dependency_graph(buffer, output_format, roots, depth)
+    except ValueError as e:
+        return str(e)
+    # Without the final newline, as print() adds one
+    return buffer.getvalue()[:-1]
+
+def build_document_metadata(record: DocumentRecord, author: Optional[str] = None,
+                            today: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Merge a document's existing metadata with the values recorded in the registry.
+    Returns the metadata dictionary to write back to the document.
+    """
+    import datetime
+    # Copy existing metadata or create new
+    metadata = dict(record.metadata)
     
     # Update metadata fields
-    metadata['doc_id'] = doc_id
-    metadata['version'] = doc_data.get('Version', '1.0.0')
-    metadata['last_updated'] = datetime.datetime.now().strftime('%Y-%m-%d')
+    metadata['doc_id'] = record.doc_id
+    metadata['version'] = record.data.get('Version', '1.0.0')
+    metadata['last_updated'] = today or datetime.datetime.now().strftime('%Y-%m-%d')
     
     if author:
         metadata['updated_by'] = author
@@ -390,139 +1657,931 @@ def update_document_metadata(doc_id: str, author: str = None) -> bool:
         metadata['updated_by'] = 'system'
     
     # Set dependencies and affects
-    depends_on = doc_data.get('Depends On', [])
-    if isinstance(depends_on, str) and depends_on != '-':
-        depends_on = [depends_on]
-    metadata['depends_on'] = [d for d in depends_on if d != '-'] if depends_on else []
-    
-    affects = doc_data.get('Affects', [])
-    if isinstance(affects, str):
-        if affects.upper() == 'ALL':
-            # Special case for ALL
-            metadata['affects'] = 'ALL'
-        elif affects != '-':
-            affects = [affects]
-    metadata['affects'] = [a for a in affects if a != '-'] if isinstance(affects, list) else metadata['affects']
+    metadata['depends_on'] = list(record.depends_on)
+    metadata['affects'] = 'ALL' if record.affects_all else list(record.affects)
+    metadata['change_requires'] = list(record.change_requires)
+    return metadata
+
+def update_documents_metadata(doc_ids: List[str], author: Optional[str] = None,
+                              index: Optional[DocumentIndex] = None, jobs: int = 1,
+                              dry_run: bool = False) -> Dict[str, MetadataUpdate]:
+    """
+    Update the metadata of many documents in one pass.
+    Existing metadata is read through the index (and its cache), then files are
+    rewritten on a pool of jobs threads. Documents whose metadata block would not
+    change are not written at all, so their mtimes and cache entries stay valid.
+    Returns a dictionary of doc_id to MetadataUpdate, in the order given.
+    """
+    if index is None:
+        index = get_document_index()
     
-    change_requires = doc_data.get('Change Requires', [])
-    if isinstance(change_requires, str) and change_requires != '-':
-        change_requires = [change_requires]
-    metadata['change_requires'] = [c for c in change_requires if c != '-'] if change_requires else []
+    results = {}
+    pending = []
+    for doc_id in doc_ids:
+        if doc_id in results:
+            continue
+        record = index.get(doc_id)
+        if record is None:
+            results[doc_id] = MetadataUpdate('', 'error', error=f"Document ID {doc_id} not found in registry")
+        elif not record.path:
+            results[doc_id] = MetadataUpdate('', 'error', error=f"Document {doc_id} has no path in registry")
+        elif not record.exists:
+            results[doc_id] = MetadataUpdate(record.file_path, 'error',
+                                             error=f"Document file {record.file_path} does not exist")
+        else:
+            results[doc_id] = None
+            pending.append(record)
+    
+    import datetime
+    index.preload(jobs, {record.doc_id for record in pending})
+    today = datetime.datetime.now().strftime('%Y-%m-%d')
+    updates = [(record.file_path, build_document_metadata(record, author, today)) for record in pending]
     
-    # Write updated metadata back to file
-    return update_metadata(file_path, metadata)
+    # Write updated metadata back to the files
+    outcomes = _parallel_map(lambda item: rewrite_metadata(item[0], item[1], dry_run), updates, jobs)
+    for record, outcome in zip(pending, outcomes):
+        if outcome.status == 'error':
+            outcome = outcome._replace(error=f"Error updating metadata in {record.file_path}: {outcome.error}")
+        elif outcome.status == 'updated' and not dry_run:
+            record.invalidate()
+        results[record.doc_id] = outcome
+    return results
 
-def validate_document_updates() -> Tuple[bool, List[str]]:
+def update_document_metadata(doc_id: str, author: str = None, index: Optional[DocumentIndex] = None) -> bool:
     """
-    Validate that documentation updates have been properly propagated.
-    Returns (is_valid, list_of_issues).
+    Update the metadata of a document by its ID.
+    Returns True if successful, False otherwise.
+    """
+    result = update_documents_metadata([doc_id], author, index)[doc_id]
+    if result.status == 'error':
+        log_error(result.error)
+        return False
+    return True
+
+def _normalize_last_updated(value: Any) -> Tuple[Any, Optional[int]]:
+    """
+    Normalize a last_updated value the way propagation checks compare it: dates
+    become YYYY-MM-DD strings, anything else is left as is.
+    Returns (value, key), where key is a YYYYMMDD integer for YYYY-MM-DD strings,
+    which orders exactly as the strings do, and None for any other value.
+    """
+    import datetime
+    if isinstance(value, datetime.date):
+        value = value.strftime('%Y-%m-%d')
+    if isinstance(value, str):
+        match = _ISO_DATE.fullmatch(value)
+        if match:
+            year, month, day = match.groups()
+            return value, int(year) * 10000 + int(month) * 100 + int(day)
+    return value, None
+
+def propagation_scope(changed: Set[str], index: Optional[DocumentIndex] = None) -> Set[str]:
+    """
+    Return the documents whose propagation can involve a changed document: its
+    registry neighbourhood, plus every document whose metadata affects ALL or a
+    changed document, as the propagation check follows metadata rather than the registry.
     """
-    issues = []
+    if index is None:
+        index = get_document_index()
+    scope = get_registry_graph(index).neighbourhood(changed)
+    for record in index:
+        if record.doc_id in scope or not record.exists:
+            continue
+        affects = record.metadata.get('affects')
+        if affects == 'ALL' or (isinstance(affects, list)
+                                and any(isinstance(aff_id, str) and aff_id in changed for aff_id in affects)):
+            scope.add(record.doc_id)
+    return scope
+
+def iter_propagation_issues(index: Optional[DocumentIndex] = None,
+                            changed: Optional[Set[str]] = None) -> Iterator[Issue]:
+    """
+    Check that documentation updates have been propagated to affected documents,
+    yielding issues as they are found. If changed is given, only propagation to
+    or from a changed document is checked.
+    Each document's last_updated is normalized once into an integer key. A document
+    that affects ALL is checked with a binary search over the sorted keys, so only
+    the stale documents are visited; values that are not YYYY-MM-DD strings fall
+    back to comparing them one by one, as before.
+    """
+    import bisect
+    if index is None:
+        index = get_document_index()
+    scope = None if changed is None else propagation_scope(changed, index)
     
-    # First check consistency
-    is_consistent, consistency_issues = check_document_consistency()
-    if not is_consistent:
-        issues.extend(consistency_issues)
+    # State of each affected document, computed on first use: None if its file
+    # does not exist, else (issue_code, last_updated, key)
+    states = {}
+    def target_state(record: DocumentRecord) -> Optional[Tuple[Optional[str], Any, Optional[int]]]:
+        if record.doc_id not in states:
+            if not record.exists:
+                states[record.doc_id] = None
+            elif not record.metadata:
+                states[record.doc_id] = ('affected-missing-metadata', None, None)
+            elif not record.metadata.get('last_updated'):
+                states[record.doc_id] = ('affected-missing-date', None, None)
+            else:
+                states[record.doc_id] = (None, *_normalize_last_updated(record.metadata['last_updated']))
+        return states[record.doc_id]
+    
+    def check_pair(doc_id: str, aff_record: DocumentRecord, last_updated: Any,
+                   last_key: Optional[int]) -> Optional[Issue]:
+        state = target_state(aff_record)
+        if state is None:
+            return None
+        code, aff_last_updated, aff_key = state
+        aff_id = aff_record.doc_id
+        if code == 'affected-missing-metadata':
+            return Issue(code, aff_id, doc_id, 'error', f"Affected document {aff_id} has no metadata")
+        if code == 'affected-missing-date':
+            return Issue(code, aff_id, doc_id, 'error', f"Affected document {aff_id} has no last_updated date")
+        
+        # Integer keys order like the YYYY-MM-DD strings; compare anything else directly
+        if aff_key is not None and last_key is not None:
+            stale = aff_key < last_key
+        else:
+            stale = aff_last_updated < last_updated
+        if stale:
+            return Issue('stale-document', aff_id, doc_id, 'warning',
+                         f"Document {aff_id} needs to be updated to reflect changes in {doc_id} (last updated: {last_updated})")
+        return None
+    
+    # Sorted keys of every document, built the first time a document affects ALL
+    all_targets = None
+    def build_all_targets() -> Tuple[List[DocumentRecord], Dict[str, int], List[int], List[int], List[int]]:
+        records = list(index)
+        keyed = []
+        irregular = []
+        for position, record in enumerate(records):
+            state = target_state(record)
+            if state is None:
+                continue
+            if state[2] is None:
+                irregular.append(position)
+            else:
+                keyed.append((state[2], position))
+        keyed.sort()
+        position_of = {record.doc_id: position for position, record in enumerate(records)}
+        return (records, position_of, [key for key, _ in keyed], [position for _, position in keyed], irregular)
     
     # Check for update propagation
-    for doc_id, doc_data in DOCUMENT_REGISTRY.items():
-        doc_path = doc_data.get('Path')
-        if not doc_path:
+    for record in index:
+        doc_id = record.doc_id
+        if scope is not None and doc_id not in scope:
             continue
-            
-        file_path = os.path.join(ROOT_DIR, doc_path)
-        if not os.path.exists(file_path):
+        if not record.exists:
             continue
         
-        metadata = extract_metadata(file_path)
+        metadata = record.metadata
         if not metadata:
             continue
         
         # Check that affects are up-to-date
-        last_updated = metadata.get('last_updated')
-        if not last_updated:
+        if not metadata.get('last_updated'):
             continue
+        last_updated, last_key = _normalize_last_updated(metadata['last_updated'])
         
-        # Ensure last_updated is a string in YYYY-MM-DD format
-        if isinstance(last_updated, datetime.date) or isinstance(last_updated, datetime.datetime):
-            last_updated = last_updated.strftime('%Y-%m-%d')
-            
         affects = metadata.get('affects', [])
+        if affects == 'ALL' and last_key is not None and (changed is None or doc_id in changed):
+            # Only documents older than this one, or whose dates need checking one
+            # by one, can produce an issue; none can if it predates them all
+            if all_targets is None:
+                all_targets = build_all_targets()
+            records, position_of, keys, positions, irregular = all_targets
+            if not irregular and (not keys or last_key <= keys[0]):
+                continue
+            own_position = position_of[doc_id]
+            candidates = positions[:bisect.bisect_left(keys, last_key)] + irregular
+            for position in sorted(candidates):
+                if position != own_position:
+                    issue = check_pair(doc_id, records[position], last_updated, last_key)
+                    if issue is not None:
+                        yield issue
+            continue
+        
         if affects == 'ALL':
             # Special case for ALL
-            affected_docs = [d for d in DOCUMENT_REGISTRY.keys() if d != doc_id]
+            affected_docs = [d for d in index.records if d != doc_id]
         elif isinstance(affects, list):
             affected_docs = affects
         else:
             affected_docs = []
         
+        if changed is not None and doc_id not in changed:
+            affected_docs = [aff_id for aff_id in affected_docs if aff_id in changed]
+        
         for aff_id in affected_docs:
-            if aff_id not in DOCUMENT_REGISTRY:
-                issues.append(f"Document {doc_id} affects non-existent document {aff_id}")
+            aff_record = index.get(aff_id)
+            if aff_record is None:
+                yield Issue('unknown-affected', doc_id, aff_id, 'error',
+                            f"Document {doc_id} affects non-existent document {aff_id}")
                 continue
-                
-            aff_data = DOCUMENT_REGISTRY[aff_id]
-            aff_path = aff_data.get('Path')
-            if not aff_path:
-                continue
-                
-            aff_file_path = os.path.join(ROOT_DIR, aff_path)
-            if not os.path.exists(aff_file_path):
-                continue
-            
-            aff_metadata = extract_metadata(aff_file_path)
-            if not aff_metadata:
-                issues.append(f"Affected document {aff_id} has no metadata")
+            issue = check_pair(doc_id, aff_record, last_updated, last_key)
+            if issue is not None:
+                yield issue
+
+def iter_validation_issues(index: Optional[DocumentIndex] = None,
+                           changed: Optional[Set[str]] = None) -> Iterator[Issue]:
+    """
+    Yield consistency issues followed by update propagation issues.
+    If changed is given, only the registry neighbourhood of those document IDs is
+    checked, and only propagation to or from a changed document is validated.
+    """
+    if index is None:
+        index = get_document_index()
+    scope = None if changed is None else get_registry_graph(index).neighbourhood(changed)
+    yield from iter_consistency_issues(index, scope)
+    yield from iter_propagation_issues(index, changed)
+
+def validate_document_updates(index: Optional[DocumentIndex] = None,
+                              changed: Optional[Set[str]] = None) -> Tuple[bool, List[str]]:
+    """
+    Validate that documentation updates have been properly propagated.
+    If changed is given, only the registry neighbourhood of those document IDs is
+    checked, and only propagation to or from a changed document is validated.
+    Returns (is_valid, list_of_issues).
+    """
+    issues = [issue.message for issue in iter_validation_issues(index, changed)]
+    return len(issues) == 0, issues
+
+class PollingWatcher:
+    """
+    Detect changes to a set of files by comparing their stat signatures,
+    checked once per interval. Works on every platform.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.signatures = {}
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def watch(self, paths: Iterable[str]) -> None:
+        """Replace the set of watched files."""
+        self.signatures = {path: self._signature(path) for path in paths}
+
+    def changes(self, timeout: float) -> Set[str]:
+        """
+        Wait up to timeout seconds for watched files to change.
+        Returns the changed paths, or an empty set if none changed in time.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, signature in self.signatures.items():
+                current = self._signature(path)
+                if current != signature:
+                    self.signatures[path] = current
+                    changed.add(path)
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+class InotifyWatcher:
+    """
+    Detect changes to a set of files with Linux inotify, called through ctypes.
+    The parent directories are watched so that editors which save by renaming a
+    temporary file over the original are still noticed.
+    """
+
+    EVENT_MASK = 0x8 | 0x4 | 0x80 | 0x100 | 0x200  # CLOSE_WRITE, ATTRIB, MOVED_TO, CREATE, DELETE
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        import struct
+        self.event_header = struct.Struct('iIII')
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        self.paths = set()
+
+    def watch(self, paths: Iterable[str]) -> None:
+        """Replace the set of watched files; directories are only ever added."""
+        self.paths = {os.path.abspath(path) for path in paths}
+        watched = set(self.directories.values())
+        for directory in {os.path.dirname(path) for path in self.paths} - watched:
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.EVENT_MASK)
+            if wd >= 0:
+                self.directories[wd] = directory
+
+    def changes(self, timeout: float) -> Set[str]:
+        """
+        Wait up to timeout seconds for watched files to change.
+        Returns the changed paths, or an empty set if none changed in time.
+        """
+        import select
+        changed = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+        # Let a burst of events from one save settle before reporting it
+        time.sleep(0.05)
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, _, _, length = self.event_header.unpack_from(buffer, offset)
+                offset += self.event_header.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+                path = os.path.join(self.directories.get(wd, ''), os.fsdecode(name))
+                if path in self.paths:
+                    changed.add(path)
+
+def create_watcher(interval: float, polling: bool = False):
+    """
+    Return an InotifyWatcher where the platform supports it, else a PollingWatcher.
+    """
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(interval)
+
+def watch_documents(interval: float = 1.0, polling: bool = False, jobs: int = 1) -> int:
+    """
+    Keep the document index in memory and revalidate documents as their files change.
+    Only changed documents are re-read, and only issues involving them are
+    recomputed; a change to the registry table reloads it and revalidates everything.
+    New and resolved issues are printed as they appear. Runs until interrupted.
+    Returns the process exit code.
+    """
+    global DOCUMENT_REGISTRY
+    master_path = os.path.join(ROOT_DIR, MASTER_FILE)
+    index = get_document_index()
+    index.preload(jobs)
+    issues = set(validate_document_updates(index)[1])
+    if issues:
+        log_error(f"{len(issues)} documentation issue(s) found:")
+        for issue in sorted(issues):
+            print(f"  • {issue}")
+    else:
+        log_success("All documents are consistent and properly updated")
+    
+    watcher = create_watcher(interval, polling)
+    watcher.watch([record.file_path for record in index if record.file_path] + [master_path])
+    log_info(f"Watching {len(index)} documents with {type(watcher).__name__} (Ctrl+C to stop)")
+    
+    try:
+        while True:
+            changed_paths = watcher.changes(interval)
+            if not changed_paths:
                 continue
+            start = time.perf_counter()
             
-            aff_last_updated = aff_metadata.get('last_updated')
-            if not aff_last_updated:
-                issues.append(f"Affected document {aff_id} has no last_updated date")
-                continue
+            registry = DOCUMENT_REGISTRY
+            if master_path in changed_paths:
+                registry = extract_document_registry_from_master() or DOCUMENT_REGISTRY
             
-            # Ensure aff_last_updated is a string in YYYY-MM-DD format
-            if isinstance(aff_last_updated, datetime.date) or isinstance(aff_last_updated, datetime.datetime):
-                aff_last_updated = aff_last_updated.strftime('%Y-%m-%d')
+            if registry != DOCUMENT_REGISTRY:
+                # The registry itself changed: rebuild the index and check everything
+                DOCUMENT_REGISTRY = registry
+                index = get_document_index()
+                index.preload(jobs)
+                current = set(validate_document_updates(index)[1])
+                added, resolved = current - issues, issues - current
+                issues = current
+                watcher.watch([record.file_path for record in index if record.file_path] + [master_path])
+                description = f"{MASTER_FILE} changed, revalidated {len(index)} documents"
+            else:
+                changed = {index.resolve(path) for path in changed_paths} - {None}
+                if not changed:
+                    continue
+                # Issues involving the changed documents, before and after re-reading them
+                before = set(validate_document_updates(index, changed)[1])
+                for doc_id in changed:
+                    index.get(doc_id).invalidate()
+                index.preload(jobs, changed)
+                after = set(validate_document_updates(index, changed)[1])
+                added, resolved = after - before, before - after
+                issues = (issues - resolved) | added
+                description = f"{', '.join(sorted(changed))} changed, revalidated"
             
-            # Compare dates (string comparison works for YYYY-MM-DD format)
-            if aff_last_updated < last_updated:
-                issues.append(f"Document {aff_id} needs to be updated to reflect changes in {doc_id} (last updated: {last_updated})")
-    
-    return len(issues) == 0, issues
+            elapsed = (time.perf_counter() - start) * 1000
+            log_info(f"{description} in {elapsed:.1f} ms ({len(issues)} issue(s) outstanding)")
+            for issue in sorted(added):
+                print(f"  + {issue}")
+            for issue in sorted(resolved):
+                print(f"  - {issue}")
+    except KeyboardInterrupt:
+        return 0
 
-def main():
+class QueryServer:
+    """
+    Answer DCS queries from an in-memory registry and document index.
+    Requests and responses are single JSON objects, one per line, e.g.
+    {"command": "impact", "doc_ids": ["DOC-A"]}. File stats are re-checked at
+    most once per refresh_interval seconds, so repeated queries skip the disk.
+    """
+
+    COMMANDS = ['check', 'validate', 'impact', 'graph', 'reload']
+
+    def __init__(self, refresh_interval: float = 1.0, jobs: int = 1):
+        self.refresh_interval = refresh_interval
+        self.jobs = jobs
+        self.master_path = os.path.join(ROOT_DIR, MASTER_FILE)
+        self.watcher = PollingWatcher()
+        self.impact_index = None
+        self.last_refresh = 0.0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        self.index = get_document_index()
+        self.index.preload(self.jobs)
+        self.impact_index = None
+        self.watcher.watch([record.file_path for record in self.index if record.file_path] + [self.master_path])
+        self.last_refresh = time.monotonic()
+
+    def refresh(self, force: bool = False) -> None:
+        """Pick up changed documents, and a changed registry, since the last refresh."""
+        global DOCUMENT_REGISTRY
+        if not force and time.monotonic() - self.last_refresh < self.refresh_interval:
+            return
+        changed_paths = self.watcher.changes(0)
+        self.last_refresh = time.monotonic()
+        if force or self.master_path in changed_paths:
+            registry = extract_document_registry_from_master()
+            if registry and registry != DOCUMENT_REGISTRY:
+                DOCUMENT_REGISTRY = registry
+                self._load_index()
+                return
+        changed = {self.index.resolve(path) for path in changed_paths} - {None}
+        for doc_id in changed:
+            self.index.get(doc_id).invalidate()
+        if changed:
+            self.index.preload(self.jobs, changed)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one query against the in-memory state.
+        Returns a JSON-serializable response with "ok" set to whether it succeeded.
+        """
+        command = request.get('command')
+        if command not in self.COMMANDS:
+            return {'ok': False, 'error': f"Unknown command {command!r}, expected one of {', '.join(self.COMMANDS)}"}
+        for field in ('doc_ids', 'roots'):
+            value = request.get(field)
+            if value is not None and not (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+                return {'ok': False, 'error': f"{field} must be a list of document IDs, got {value!r}"}
+        depth = request.get('depth')
+        if depth is not None and (not isinstance(depth, int) or isinstance(depth, bool) or depth < 0):
+            return {'ok': False, 'error': f"depth must be a non-negative integer, got {depth!r}"}
+        self.refresh(force=command == 'reload')
+        index = self.index
+        
+        if command == 'check':
+            scope = request.get('doc_ids')
+            is_consistent, issues = check_document_consistency(index, None if scope is None else set(scope))
+            return {'ok': True, 'consistent': is_consistent, 'issues': issues}
+        
+        if command == 'validate':
+            changed = request.get('doc_ids')
+            is_valid, issues = validate_document_updates(index, None if changed is None else set(changed))
+            return {'ok': True, 'valid': is_valid, 'issues': issues}
+        
+        if command == 'impact':
+            if self.impact_index is None:
+                self.impact_index = ImpactIndex.build(get_registry_graph(index))
+            result = analyze_impact_batch(request.get('doc_ids', []), index, impact_index=self.impact_index)
+            return dict(result, ok=True)
+        
+        if command == 'graph':
+            from io import StringIO
+            buffer = StringIO()
+            roots = request.get('roots')
+            try:
+                write_dependency_graph(buffer, request.get('format', 'json'),
+                                       None if roots is None else {index.resolve(root) or root for root in roots},
+                                       request.get('depth'), index)
+            except ValueError as e:
+                return {'ok': False, 'error': str(e)}
+            return {'ok': True, 'graph': buffer.getvalue()}
+        
+        return {'ok': True, 'documents': len(index)}
+
+    async def _serve_client(self, reader, writer) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    response = self.handle(request)
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"Invalid request: {str(e)}"}
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                writer.write(json.dumps(response, default=str).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, port: Optional[int] = None, socket_path: Optional[str] = None) -> None:
+        """Listen on a Unix socket, or on a localhost TCP port, until cancelled."""
+        import asyncio
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(self._serve_client, path=socket_path)
+            address = socket_path
+        else:
+            server = await asyncio.start_server(self._serve_client, host='127.0.0.1', port=port)
+            address = f"127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        log_info(f"Serving {len(self.index)} documents on {address} (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+def serve_queries(port: Optional[int] = None, socket_path: Optional[str] = None,
+                  refresh_interval: float = 1.0, jobs: int = 1) -> int:
+    """
+    Run a QueryServer until interrupted.
+    Returns the process exit code.
+    """
+    import asyncio
+    server = QueryServer(refresh_interval, jobs)
+    # A plain event loop lets Ctrl+C raise KeyboardInterrupt straight away
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(server.serve(port, socket_path))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        log_error(f"Could not start server: {str(e)}")
+        return 1
+    finally:
+        loop.close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+OUTPUT_FORMATS = ['text', 'json', 'ndjson']
+
+class RecordWriter:
+    """
+    Stream structured command results to stdout for --format json or ndjson.
+    ndjson writes one object per line followed by a summary line; json writes a
+    single object whose "records" array is written element by element. Neither
+    format holds the result set in memory.
+    """
+
+    def __init__(self, output_format: str, command: str, out: Optional[TextIO] = None):
+        self.ndjson = output_format == 'ndjson'
+        self.command = command
+        self.out = out or sys.stdout
+        self.count = 0
+        if not self.ndjson:
+            self.out.write(f'{{"command": {json.dumps(command)}, "records": [')
+
+    def write(self, record_type: str, record: Dict[str, Any]) -> None:
+        line = json.dumps(dict(type=record_type, **record), default=str)
+        if self.ndjson:
+            self.out.write(line + '\n')
+        else:
+            self.out.write((',\n  ' if self.count else '\n  ') + line)
+        self.count += 1
+
+    def close(self, summary: Dict[str, Any]) -> None:
+        summary = dict(command=self.command, records=self.count, **summary)
+        if self.ndjson:
+            self.out.write(json.dumps(dict(type='summary', **summary)) + '\n')
+        else:
+            self.out.write(('\n' if self.count else '') + f'], "summary": {json.dumps(summary)}}}\n')
+        self.out.flush()
+
+def emit_issues(writer: RecordWriter, issues: Iterable[Issue]) -> int:
+    """
+    Write issues to writer as they are produced, then a summary with counts by severity.
+    Returns the process exit code: 1 if there were any issues.
+    """
+    severities = {}
+    for issue in issues:
+        writer.write('issue', issue.to_dict())
+        severities[issue.severity] = severities.get(issue.severity, 0) + 1
+    total = sum(severities.values())
+    writer.close({'ok': total == 0, 'issues': total, 'by_severity': severities})
+    return 1 if total else 0
+
+class PhaseTimer:
+    """
+    Wall-clock durations of the consecutive phases of a run.
+    Each call to mark() ends the current phase and records it under a name.
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    @property
+    def total(self) -> float:
+        return self.last - self.start
+
+class RunStats:
+    """
+    Instrumentation for --timings: wall time accumulated per phase (phases may be
+    entered many times), event counts, and the time spent on each document.
+    """
+
+    def __init__(self):
+        self.phases = OrderedDict()
+        self.counts = OrderedDict()
+        self.document_times = {}
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def add_document_time(self, file_path: str, seconds: float) -> None:
+        path = os.path.relpath(file_path, ROOT_DIR).replace(os.sep, '/')
+        self.document_times[path] = self.document_times.get(path, 0.0) + seconds
+
+    def report(self, timer: PhaseTimer, top: int = 10) -> Dict[str, Any]:
+        """
+        Combine the run's top-level phases with the instrumented ones. Time spent in
+        the command outside stat/read/parse is reported as 'checks'.
+        Returns a JSON-serializable dict of millisecond timings, counts and the
+        slowest top documents.
+        """
+        phases = OrderedDict()
+        for name, seconds in timer.phases:
+            if name != 'command':
+                phases[name] = seconds
+                continue
+            instrumented = 0.0
+            for phase in ['stat', 'read', 'parse']:
+                if phase in self.phases:
+                    phases[phase] = self.phases[phase]
+                    instrumented += self.phases[phase]
+            phases['checks'] = max(0.0, seconds - instrumented)
+        
+        counts = OrderedDict(self.counts)
+        if METADATA_CACHE is not None:
+            counts['cache_hits'] = METADATA_CACHE.hits
+            counts['cache_misses'] = METADATA_CACHE.misses
+        if DOCUMENT_INDEX is not None:
+            counts['documents'] = len(DOCUMENT_INDEX)
+        
+        slowest = sorted(self.document_times.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {
+            'phases_ms': {name: round(seconds * 1000, 3) for name, seconds in phases.items()},
+            'total_ms': round(timer.total * 1000, 3),
+            'counts': counts,
+            'slowest_documents': [{'path': path, 'ms': round(seconds * 1000, 3)} for path, seconds in slowest],
+        }
+
+def print_timings(report: Dict[str, Any]) -> None:
+    """Print a --timings report as a table on stderr."""
+    out = sys.stderr
+    out.write("Timings:\n")
+    for name, ms in report['phases_ms'].items():
+        out.write(f"  {name:<12} {ms:10.2f} ms\n")
+    out.write(f"  {'total':<12} {report['total_ms']:10.2f} ms\n")
+    if report['counts']:
+        out.write("Counts:\n")
+        for name, value in report['counts'].items():
+            out.write(f"  {name:<12} {value:10d}\n")
+    if report['slowest_documents']:
+        out.write("Slowest documents:\n")
+        for entry in report['slowest_documents']:
+            out.write(f"  {entry['ms']:10.2f} ms  {entry['path']}\n")
+
+# Modules imported only on the code paths that need them
+LAZY_MODULES = ['yaml', 'datetime', 'hashlib', 'subprocess', 'tempfile', 'asyncio', 'concurrent.futures']
+
+def report_startup_profile(timer: PhaseTimer) -> None:
+    """Print phase timings, and which deferred modules were imported, to stderr."""
+    out = sys.stderr
+    out.write("Startup profile:\n")
+    for name, seconds in timer.phases:
+        out.write(f"  {name:<12} {seconds * 1000:8.2f} ms\n")
+    out.write(f"  {'total':<12} {timer.total * 1000:8.2f} ms\n")
+    loaded = [name for name in LAZY_MODULES if name in sys.modules]
+    out.write(f"  lazy imports: {', '.join(loaded) or 'none'}\n")
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command-line parser for the DCS tool."""
     parser = argparse.ArgumentParser(description="Documentation Control System Tool")
     
     # Command-line arguments
-    parser.add_argument('--update-meta', metavar='DOC_ID', help='Update metadata for document ID')
+    parser.add_argument('--update-meta', metavar='DOC_ID', nargs='+', help='Update metadata for one or more document IDs')
+    parser.add_argument('--update-meta-all', action='store_true', help='Update metadata for every registered document')
+    parser.add_argument('--dry-run', action='store_true', help='Show metadata updates as a diff without writing them')
     parser.add_argument('--author', help='Author name for metadata updates')
     parser.add_argument('--check', action='store_true', help='Check document consistency')
     parser.add_argument('--impact', metavar='DOC_ID', help='Analyze impact of changing document')
+    parser.add_argument('--impact-batch', metavar='DOC_ID_OR_PATH', nargs='*',
+                        help='Analyze impact of many documents as JSON (IDs or paths; reads stdin if none or "-")')
     parser.add_argument('--graph', action='store_true', help='Generate dependency graph')
-    parser.add_argument('--graph-format', choices=['text', 'dot'], default='text', help='Graph output format')
+    parser.add_argument('--graph-format', choices=GRAPH_FORMATS, default='text', help='Graph output format')
+    parser.add_argument('--graph-output', metavar='FILE', help='Write the graph to FILE instead of stdout')
+    parser.add_argument('--root', metavar='DOC_ID', action='append',
+                        help='Only graph documents connected to DOC_ID (may be repeated)')
+    parser.add_argument('--depth', type=int, metavar='K', help='With --root, only graph documents within K hops')
     parser.add_argument('--validate', action='store_true', help='Validate document update propagation')
     parser.add_argument('--verify', action='store_true', help='Comprehensive verification of documentation state')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and revalidate documents as their files change')
+    parser.add_argument('--watch-interval', type=float, default=1.0, metavar='SECONDS',
+                        help='Polling interval for --watch when inotify is unavailable (default: %(default)s)')
+    parser.add_argument('--watch-polling', action='store_true', help='Use mtime polling for --watch even where inotify is available')
+    parser.add_argument('--serve', action='store_true',
+                        help='Answer check/validate/impact/graph queries as JSON lines from a local server')
+    parser.add_argument('--port', type=int, default=8765, help='Localhost TCP port for --serve (default: %(default)s)')
+    parser.add_argument('--socket', metavar='PATH', help='Serve on a Unix socket at PATH instead of a TCP port')
+    parser.add_argument('--refresh-interval', type=float, default=1.0, metavar='SECONDS',
+                        help='How often --serve re-checks document files for changes (default: %(default)s)')
+    parser.add_argument('--since', metavar='GIT_REF',
+                        help='Only check documents changed since a git ref, plus their registry neighbours (implies --validate)')
+    parser.add_argument('--no-cache', action='store_true', help=f'Do not read or write the {CACHE_DIR} caches')
+    parser.add_argument('--rebuild-cache', action='store_true', help='Discard the caches and re-parse every document')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='Read and parse documents with N parallel workers (default: %(default)s)')
+    parser.add_argument('--max-header-bytes', type=int,
+                        help=f'Maximum size of a document metadata block (default: {DEFAULT_MAX_HEADER_BYTES})')
+    parser.add_argument('--config', default=DEFAULT_CONFIG_PATH,
+                        help='JSON settings file, relative to the project root (default: %(default)s)')
     
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text',
+                        help='Output for --check, --validate, --verify, --impact and --update-meta: '
+                             'coloured text, or structured records as one JSON document or as JSON lines')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Report import and phase timings, and the lazily imported modules, on stderr')
+    parser.add_argument('--timings', action='store_true',
+                        help='Report phase timings, file counts and the slowest documents on stderr')
+    parser.add_argument('--timings-json', metavar='FILE',
+                        help='Write the --timings report as JSON to FILE')
+    parser.add_argument('--timings-top', type=int, default=10, metavar='N',
+                        help='Number of slowest documents to report (default: %(default)s)')
+    return parser
+
+def main():
+    global DOCUMENT_REGISTRY, METADATA_CACHE, MAX_HEADER_BYTES, MASTER_FILE, CACHE_DIR, RUN_STATS, LOG_FILE
+    timer = PhaseTimer(_PROCESS_START)
+    timer.mark('imports')
+    parser = build_parser()
     args = parser.parse_args()
+    if args.depth is not None and not args.root:
+        parser.error('--depth requires --root')
+    if args.depth is not None and args.depth < 0:
+        parser.error(f'--depth must be a non-negative integer, got {args.depth}')
+    if args.format != 'text':
+        LOG_FILE = sys.stderr
+    if args.timings or args.timings_json:
+        RUN_STATS = RunStats()
+    timer.mark('arguments')
+    
+    config = load_config(args.config)
+    MASTER_FILE = config['master_file']
+    CACHE_DIR = config['cache_dir']
+    MAX_HEADER_BYTES = args.max_header_bytes or config['max_header_bytes']
+    timer.mark('config')
     
     # Load document registry from README-Master.md
-    global DOCUMENT_REGISTRY
-    DOCUMENT_REGISTRY = extract_document_registry_from_master()
+    DOCUMENT_REGISTRY = extract_document_registry_from_master(
+        use_snapshot=config['registry_snapshot'] and not args.no_cache, rebuild=args.rebuild_cache)
+    timer.mark('registry')
     
     if not DOCUMENT_REGISTRY:
-        log_error("Failed to load document registry from README-Master.md")
+        log_error(f"Failed to load document registry from {MASTER_FILE}")
         return 1
     
-    # Handle commands
-    if args.update_meta:
-        if update_document_metadata(args.update_meta, args.author):
-            log_success(f"Updated metadata for document {args.update_meta}")
+    if not args.no_cache:
+        METADATA_CACHE = MetadataCache(os.path.join(ROOT_DIR, CACHE_DIR, METADATA_CACHE_FILE),
+                                       config['cache_max_entries'])
+        if args.rebuild_cache:
+            METADATA_CACHE.clear()
         else:
-            log_error(f"Failed to update metadata for document {args.update_meta}")
+            METADATA_CACHE.load()
+    timer.mark('cache-load')
+    
+    try:
+        return run_command(args, parser)
+    finally:
+        timer.mark('command')
+        if METADATA_CACHE is not None:
+            METADATA_CACHE.save()
+        timer.mark('cache-save')
+        if args.profile_startup:
+            report_startup_profile(timer)
+        if RUN_STATS is not None:
+            report = RUN_STATS.report(timer, args.timings_top)
+            if args.timings:
+                print_timings(report)
+            if args.timings_json:
+                try:
+                    with open(args.timings_json, 'w', encoding='utf-8') as f:
+                        json.dump(report, f, indent=2)
+                except OSError as e:
+                    log_error(f"Could not write timings to {args.timings_json}: {str(e)}")
+
+def run_command(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """
+    Dispatch the command selected on the command line.
+    Returns the process exit code.
+    """
+    if args.watch:
+        return watch_documents(args.watch_interval, args.watch_polling, args.jobs)
+    if args.serve:
+        return serve_queries(args.port, args.socket, args.refresh_interval, args.jobs)
+    
+    # Restrict checks to documents changed since a git ref
+    changed = None
+    scope = None
+    if args.since and not (args.update_meta or args.update_meta_all or args.impact or args.impact_batch is not None or args.graph):
+        import subprocess
+        try:
+            changed, registry_changed = changed_documents_since(args.since)
+        except subprocess.CalledProcessError as e:
+            log_error(f"Could not list changes since {args.since}: {e.stderr.strip()}")
             return 1
+        except OSError as e:
+            log_error(f"Could not run git: {str(e)}")
+            return 1
+        
+        if registry_changed:
+            log_info(f"{MASTER_FILE} changed, checking all documents")
+            changed = None
+        elif not changed:
+            log_success(f"No registered documents changed since {args.since}")
+            if args.format != 'text':
+                command = 'check' if args.check else 'verify' if args.verify else 'validate'
+                RecordWriter(args.format, command).close({'ok': True, 'issues': 0, 'by_severity': {}})
+            return 0
+        else:
+            scope = get_registry_graph().neighbourhood(changed)
+            log_info(f"Checking {len(changed)} changed document(s) since {args.since} "
+                     f"({len(scope)} including neighbours)")
+        
+        if not (args.check or args.validate or args.verify):
+            args.validate = True
+    
+    if args.check or args.validate or args.verify:
+        # Propagation follows metadata affects, so every document's metadata is needed to scope it
+        get_document_index().preload(args.jobs, scope if not (args.validate or args.verify) else None)
+    
+    # Handle commands
+    if args.update_meta or args.update_meta_all:
+        doc_ids = list(DOCUMENT_REGISTRY) if args.update_meta_all else args.update_meta
+        results = update_documents_metadata(doc_ids, args.author, jobs=args.jobs, dry_run=args.dry_run)
+        if args.format != 'text':
+            writer = RecordWriter(args.format, 'update-meta')
+            statuses = {}
+            for doc_id, result in results.items():
+                writer.write('metadata-update', {'doc_id': doc_id, 'status': result.status,
+                                                 'error': result.error, 'diff': result.diff})
+                statuses[result.status] = statuses.get(result.status, 0) + 1
+            writer.close({'ok': 'error' not in statuses, 'dry_run': args.dry_run, 'by_status': statuses})
+            return 1 if 'error' in statuses else 0
+        failed = 0
+        for doc_id, result in results.items():
+            if result.status == 'error':
+                log_error(result.error)
+                log_error(f"Failed to update metadata for document {doc_id}")
+                failed += 1
+            elif result.status == 'unchanged':
+                log_info(f"Metadata for document {doc_id} is already up to date")
+            elif args.dry_run:
+                sys.stdout.write(result.diff)
+            else:
+                log_success(f"Updated metadata for document {doc_id}")
+        if len(results) > 1:
+            updated = sum(1 for result in results.values() if result.status == 'updated')
+            unchanged = sum(1 for result in results.values() if result.status == 'unchanged')
+            verb = 'would update' if args.dry_run else 'updated'
+            log_info(f"{verb.capitalize()} {updated}, unchanged {unchanged}, failed {failed} of {len(results)} documents")
+        if failed:
+            return 1
+    
+    elif args.check and args.format != 'text':
+        return emit_issues(RecordWriter(args.format, 'check'), iter_consistency_issues(scope=scope))
     
     elif args.check:
-        is_consistent, issues = check_document_consistency()
+        is_consistent, issues = check_document_consistency(scope=scope)
         if is_consistent:
             log_success("All documents are consistent")
         else:
@@ -533,20 +2592,56 @@ def main():
     
     elif args.impact:
         affected = analyze_impact(args.impact)
-        if affected:
+        node_of = get_registry_graph().node_of
+        if args.format != 'text':
+            writer = RecordWriter(args.format, 'impact')
+            for aff_id in sorted(affected, key=node_of.get):
+                writer.write('affected', {'doc_id': aff_id, 'related_id': args.impact,
+                                          'path': DOCUMENT_REGISTRY.get(aff_id, {}).get('Path')})
+            writer.close({'ok': True, 'doc_id': args.impact, 'affected': len(affected)})
+        elif affected:
             log_info(f"Changing document {args.impact} will affect:")
-            for aff_id in affected:
+            for aff_id in sorted(affected, key=node_of.get):
                 doc_path = DOCUMENT_REGISTRY.get(aff_id, {}).get('Path', 'unknown')
                 print(f"  • {aff_id} ({doc_path})")
         else:
             log_info(f"Document {args.impact} has no downstream impacts")
     
+    elif args.impact_batch is not None:
+        items = [item for item in args.impact_batch if item != '-']
+        if not items or '-' in args.impact_batch:
+            items.extend(sys.stdin.read().split())
+        result = analyze_impact_batch(items, use_cache=not args.no_cache, rebuild=args.rebuild_cache)
+        print(json.dumps(result, indent=2))
+    
     elif args.graph:
-        graph = generate_dependency_graph(args.graph_format)
-        print(graph)
+        roots = None
+        if args.root:
+            index = get_document_index()
+            roots = {index.resolve(item) or item for item in args.root}
+            unknown = sorted(doc_id for doc_id in roots if doc_id not in index)
+            if unknown:
+                log_error(f"Unknown document(s) for --root: {', '.join(unknown)}")
+                return 1
+        
+        if args.graph_output:
+            with open(args.graph_output, 'w', encoding='utf-8') as f:
+                write_dependency_graph(f, args.graph_format, roots, args.depth)
+            log_success(f"Wrote dependency graph to {args.graph_output}")
+        else:
+            write_dependency_graph(sys.stdout, args.graph_format, roots, args.depth)
+    
+    elif args.validate and args.format != 'text':
+        return emit_issues(RecordWriter(args.format, 'validate'), iter_validation_issues(changed=changed))
+    
+    elif args.verify and args.format != 'text':
+        # Each issue once: consistency over the scope, then propagation
+        issues = iter_consistency_issues(scope=scope)
+        return emit_issues(RecordWriter(args.format, 'verify'),
+                           itertools.chain(issues, iter_propagation_issues(changed=changed)))
     
     elif args.validate:
-        is_valid, issues = validate_document_updates()
+        is_valid, issues = validate_document_updates(changed=changed)
         if is_valid:
             log_success("All document updates have been properly propagated")
         else:
@@ -560,7 +2655,7 @@ def main():
         log_info("Performing comprehensive verification...")
         
         # Check consistency
-        is_consistent, consistency_issues = check_document_consistency()
+        is_consistent, consistency_issues = check_document_consistency(scope=scope)
         if is_consistent:
             log_success("Document consistency check passed")
         else:
@@ -569,7 +2664,7 @@ def main():
                 print(f"  • {issue}")
         
         # Validate updates
-        is_valid, validation_issues = validate_document_updates()
+        is_valid, validation_issues = validate_document_updates(changed=changed)
         if is_valid:
             log_success("Document update propagation check passed")
         else: